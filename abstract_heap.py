@@ -1,11 +1,25 @@
+from heapq import heapify, heappop, heappush
+from itertools import islice
+
+
 # Abstract interface for HeapNodes
 class HeapNode:
+    __slots__ = ()  # let node classes be slotted
     key = None
     right = None
     child = None
     val = None
 
 
+# Stable reference to an item of a heap.
+# handle.node is the current node of the item, also after decrease_key.
+class Handle:
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+
 # Abstract interface of the heap
 class Heap:
 
@@ -38,7 +52,151 @@ class Heap:
     def decrease_key(self, node, new_key):
         raise NotImplementedError
 
+    # Change the key of the given node to any new key.
+    # This default deletes and inserts the item again when the key
+    # increases, engines can do better.
+    # Return the updated node.
+    def update_key(self, node, new_key):
+        key = self.key(node)
+        if new_key == key:
+            return node
+        if new_key < key:
+            return self.decrease_key(node, new_key)
+        value = self.value(node)
+        self.delete(node)
+        return self.insert(new_key, value)
+
     # Merge another heap into this heap.
+    # The nodes of the given heap are nodes of this heap afterwards.
+    # Engines with integer handles return the offset of the moved
+    # handles: handle h of the given heap is handle h + offset of this
+    # heap, and the given heap is left empty. The others return None.
     # Amortized time complexity: O(1)
     def merge(self, heap):
         raise NotImplementedError
+
+    # Insert many items to the heap.
+    # items are keys, or (key, value) pairs if pairs is True.
+    # Return the nodes in input order.
+    def insert_many(self, items, pairs=False):
+        if pairs:
+            return [self.insert(key, value) for key, value in items]
+        return [self.insert(key) for key in items]
+
+    # Return a new heap which has the given items,
+    # and the nodes of the items in input order.
+    @classmethod
+    def from_iterable(cls, items, pairs=False):
+        heap = cls()
+        return heap, heap.insert_many(items, pairs)
+
+    # Iterate over the (key, value) pairs of the items,
+    # in no particular order.
+    # Time complexity: O(n)
+    def items(self):
+        key, value = self.key, self.value
+        return ((key(n), value(n)) for n in self._nodes())
+
+    # Iterate over the nodes of the items
+    def _nodes(self):
+        raise NotImplementedError
+
+    # Iterate over the nodes from the smallest key up, without changing
+    # the heap. The heap must not be changed during the iteration.
+    # The trees are walked with a frontier of the nodes whose parents
+    # have been visited, every visited node adds its children to it.
+    # Time complexity: O(r) to start, r is the amount of roots, and
+    # O(c log m) per node, c is the amount of its children and m the
+    # size of the frontier
+    def iter_sorted(self):
+        key = self.key
+        children = self._children
+        frontier = [(key(n), i, n) for i, n in enumerate(self._roots())]
+        heapify(frontier)
+        count = len(frontier)  # breaks the ties, nodes are not compared
+        while frontier:
+            n = heappop(frontier)[2]
+            yield n
+            for c in children(n):
+                heappush(frontier, (key(c), count, c))
+                count += 1
+
+    # Return the nodes of the k smallest keys in sorted order,
+    # without changing the heap.
+    # Time complexity: the first k nodes of iter_sorted
+    def k_smallest(self, k):
+        return list(islice(self.iter_sorted(), k))
+
+    # Delete the nodes whose key is not larger than threshold.
+    # Return them in sorted order.
+    # Time complexity: O(m log m), m is the amount of the deleted nodes,
+    # and _delete_nodes
+    def pop_until(self, threshold):
+        nodes = list(self._nodes_until(threshold))
+        nodes.sort(key=self.key)
+        self._delete_nodes(nodes)
+        return nodes
+
+    # Delete the nodes of the k smallest keys.
+    # Return them in sorted order.
+    # Time complexity: the nodes of iter_sorted and _delete_nodes
+    def pop_many(self, k):
+        nodes = self.k_smallest(k)
+        self._delete_nodes(nodes)
+        return nodes
+
+    # Delete the given nodes, the parent of every node is given too.
+    # Engines can restructure the heap once for all of them.
+    def _delete_nodes(self, nodes):
+        for n in nodes:
+            self.delete(n)
+
+    # Iterate over the nodes whose key is smaller than the given key,
+    # in no particular order, without changing the heap.
+    # Time complexity: O(m), m is the amount of the visited nodes
+    def iter_below(self, key):
+        return self._nodes_until(key, strict=True)
+
+    # Return the amount of the nodes whose key is smaller than the given
+    # key, without changing the heap.
+    # Time complexity: the nodes of iter_below
+    def count_below(self, key):
+        return sum(1 for _ in self._nodes_until(key, strict=True))
+
+    # Iterate over the nodes whose key is not larger than threshold, or
+    # with strict smaller than threshold, in no particular order.
+    # The walk does not go below a key which is out of the range.
+    def _nodes_until(self, threshold, strict=False):
+        key = self.key
+        children = self._children
+        if strict:
+            inside = lambda n: key(n) < threshold
+        else:
+            inside = lambda n: not threshold < key(n)
+        stack = [n for n in self._roots() if inside(n)]
+        while stack:
+            n = stack.pop()
+            yield n
+            stack.extend(c for c in children(n) if inside(c))
+
+    # Iterate over the roots of the trees
+    def _roots(self):
+        raise NotImplementedError
+
+    # Iterate over the children of the node
+    def _children(self, node):
+        raise NotImplementedError
+
+    # Return a stable handle of the item of the given node.
+    # Engines whose nodes never change can use this default.
+    def handle(self, node):
+        return Handle(node)
+
+    # Return the key of the given node.
+    # Lets generic code work with engines whose handles are not nodes.
+    def key(self, node):
+        return node.key
+
+    # Return the value of the given node.
+    def value(self, node):
+        return node.val
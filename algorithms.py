@@ -0,0 +1,157 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from hollow_heap import HollowHeap
+
+# Graph algorithms which work with any heap engine.
+#
+# A graph with n vertices is given in CSR form: the edges of the vertex u
+# are indices[indptr[u]:indptr[u + 1]] with the weights at the same
+# positions of weights. The arrays can be lists, array.array or NumPy
+# arrays. The weights must be non-negative.
+#
+# decrease_key returns the node to use from then on (HollowHeap returns
+# a new node), so the handles are always replaced by the returned one.
+
+
+# Single-source shortest paths.
+# Return (dist, pred), where dist[v] is the distance from the source to v,
+# or math.inf if v is unreachable, and pred[v] is the previous vertex on
+# the shortest path, or -1.
+def dijkstra(indptr, indices, weights, source, heap_type=HollowHeap):
+    n = len(indptr) - 1
+    dist = [math.inf] * n
+    pred = [-1] * n
+    done = bytearray(n)
+    handles = [None] * n
+
+    heap = heap_type()
+    value = heap.value
+    dist[source] = 0
+    handles[source] = heap.insert(0, source)
+    while heap.no_nodes:
+        u = value(heap.delete_min())
+        handles[u] = None
+        done[u] = 1
+        d = dist[u]
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if done[v]:
+                continue
+            new_dist = d + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                if handles[v] is None:
+                    handles[v] = heap.insert(new_dist, v)
+                else:
+                    handles[v] = heap.decrease_key(handles[v], new_dist)
+    return dist, pred
+
+
+# Minimum spanning tree of the component of root in an undirected graph.
+# Every edge must be given in both directions.
+# Return (parent, total), where parent[v] is the parent of v in the tree,
+# or -1 for the root and vertices outside the component, and total is
+# the total weight of the tree.
+def prim(indptr, indices, weights, root=0, heap_type=HollowHeap):
+    n = len(indptr) - 1
+    best = [math.inf] * n  # lightest known edge to the tree
+    parent = [-1] * n
+    done = bytearray(n)
+    handles = [None] * n
+    total = 0
+
+    heap = heap_type()
+    value = heap.value
+    best[root] = 0
+    handles[root] = heap.insert(0, root)
+    while heap.no_nodes:
+        u = value(heap.delete_min())
+        handles[u] = None
+        done[u] = 1
+        total += best[u]
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            w = weights[i]
+            if done[v] or not w < best[v]:
+                continue
+            best[v] = w
+            parent[v] = u
+            if handles[v] is None:
+                handles[v] = heap.insert(w, v)
+            else:
+                handles[v] = heap.decrease_key(handles[v], w)
+    return parent, total
+
+
+# Shortest path from source to target guided by heuristic(v), a lower
+# bound of the distance from v to the target. The heuristic must be
+# consistent, so that a vertex is final when it is deleted from the heap.
+# Return (distance, path), or (math.inf, []) if target is unreachable.
+def a_star(indptr, indices, weights, source, target, heuristic, heap_type=HollowHeap):
+    n = len(indptr) - 1
+    dist = [math.inf] * n
+    pred = [-1] * n
+    done = bytearray(n)
+    handles = [None] * n
+
+    heap = heap_type()
+    value = heap.value
+    dist[source] = 0
+    handles[source] = heap.insert(heuristic(source), source)
+    while heap.no_nodes:
+        u = value(heap.delete_min())
+        if u == target:
+            break
+        handles[u] = None
+        done[u] = 1
+        d = dist[u]
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if done[v]:
+                continue
+            new_dist = d + weights[i]
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                pred[v] = u
+                estimate = new_dist + heuristic(v)
+                if handles[v] is None:
+                    handles[v] = heap.insert(estimate, v)
+                else:
+                    handles[v] = heap.decrease_key(handles[v], estimate)
+
+    if dist[target] == math.inf:
+        return math.inf, []
+    path = [target]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return dist[target], path
+
+
+# the graph of a worker process, set once by _init_worker
+_worker_graph = None
+
+
+def _init_worker(indptr, indices, weights, heap_type):
+    global _worker_graph
+    _worker_graph = (indptr, indices, weights, heap_type)
+
+
+def _worker_dijkstra(source):
+    indptr, indices, weights, heap_type = _worker_graph
+    return dijkstra(indptr, indices, weights, source, heap_type)
+
+
+# Run dijkstra from every source on a process pool.
+# The graph is sent once to every worker process.
+# Return the (dist, pred) pairs in the order of the sources.
+def dijkstra_many(
+    indptr, indices, weights, sources, heap_type=HollowHeap, processes=None
+):
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(indptr, indices, weights, heap_type),
+    ) as pool:
+        return list(pool.map(_worker_dijkstra, sources))
@@ -0,0 +1,443 @@
+import math
+from array import array
+import abstract_heap as heap
+
+NIL = -1  # empty pointer
+LINK = "i"  # typecode of the pointer columns, 32-bit handles
+
+# 1 / log(golden ratio), the degree bound is log(n) * _INV_LOG_PHI
+_INV_LOG_PHI = 1 / math.log((1 + math.sqrt(5)) / 2)
+
+
+# Implementation of FibonacciHeap with struct-of-arrays storage.
+# Every node is a slot in parallel columns, and a node is referred to by
+# its slot index (a small integer handle) instead of by a node object.
+# https://en.wikipedia.org/wiki/Fibonacci_heap
+class ArrayFibonacciHeap(heap.Heap):
+    def __init__(self):
+        self.min = NIL
+        self.no_nodes = 0
+
+        # one column per node field, indexed by the handle,
+        # the degrees are below 256 as long as there are < 2**32 nodes
+        self._key = []
+        self._val = []
+        self._parent = array(LINK)
+        self._child = array(LINK)
+        self._left = array(LINK)
+        self._right = array(LINK)
+        self._degree = bytearray()
+        self._flag = bytearray()
+
+        # handles of deleted nodes, reused by insert
+        self._free = array(LINK)
+        # handles given out by delete_min and pop_until, their key and
+        # value are cleared by the next insert or delete
+        self._released = array(LINK)
+        self._degree_table = []
+
+    # Return the handle of the minimum node, or None if the heap is empty.
+    # Amortized time complexity: O(1)
+    def find_min(self):
+        if self.min == NIL:
+            return None
+        return self.min
+
+    # Return the key of the given handle.
+    def key(self, node):
+        return self._key[node]
+
+    # Return the value of the given handle.
+    def value(self, node):
+        return self._val[node]
+
+    # Insert new item as a node to the heap.
+    # Can be called with key (key) or value and key (key, value).
+    # Return the handle of the node.
+    # Amortized time complexity: O(1)
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        n = self._new_node(key, value)
+
+        # totally new heap
+        if self.no_nodes == 0:
+            self.min = n
+        # otherwise add to root next to min
+        else:
+            self._add_root(n)
+
+        self.no_nodes += 1
+
+        return n
+
+    # Delete the given node.
+    # Amortized time complexity: O(log n)
+    def delete(self, node):
+        if node == self.min:
+            self.delete_min()
+            return
+        if self._released:
+            self._clear_released()
+
+        # cut the node to the root level
+        parent = self._parent[node]
+        if parent != NIL:
+            self._cut(node)
+            self._cascading_cut(parent)
+
+        # the min stays, so there is no need to consolidate
+        self._move_children_to_root(node)
+        self._remove_node(node)
+        self.no_nodes -= 1
+        self._key[node] = self._val[node] = None
+        self._free.append(node)
+
+    # Delete the min node and return its handle.
+    # The key and the value of the handle stay readable until the next
+    # insert or delete.
+    # Amortized time complexity: O(log n)
+    def delete_min(self):
+        if self._released:
+            self._clear_released()
+        prev_min = self.min
+        if prev_min == NIL:
+            return None
+
+        right = self._right
+        self._move_children_to_root(prev_min)
+
+        # remove current min
+        if right[prev_min] != prev_min:
+            self.min = right[prev_min]
+            self._remove_node(prev_min)
+            self._consolidate()
+        # no nodes left
+        else:
+            self.min = NIL
+            self._remove_node(prev_min)
+
+        self.no_nodes -= 1
+        self._released.append(prev_min)
+        return prev_min
+
+    # Make the degrees of root elements unique, fibonacci sequence
+    def _consolidate(self):
+        key = self._key
+        degree = self._degree
+        left = self._left
+        right = self._right
+
+        # degrees are at most log_phi(n), so the table of the previous
+        # consolidation is reused and only grows with the heap
+        table = self._degree_table
+        size = int(math.log(self.no_nodes) * _INV_LOG_PHI) + 2
+        if len(table) < size:
+            table.extend([NIL] * (size - len(table)))
+
+        # detach the roots one by one and link the same degrees together
+        n = self.min
+        right[left[n]] = NIL
+        max_degree = 0
+        while n != NIL:
+            next_node = right[n]
+            left[n] = right[n] = n
+
+            d = degree[n]
+            # combine nodes until no same root degrees exists
+            while table[d] != NIL:
+                m = table[d]
+                # make sure that n is always smaller
+                if key[m] < key[n]:
+                    n, m = m, n
+                self._add_child(m, n)
+                table[d] = NIL
+                d += 1
+                if d == len(table):
+                    table.append(NIL)
+
+            table[d] = n
+            if d > max_degree:
+                max_degree = d
+            n = next_node
+
+        # the roots left in the table form the new root layer,
+        # collect them and clear the table for the next time
+        self.min = NIL
+        for d in range(max_degree + 1):
+            n = table[d]
+            if n != NIL:
+                table[d] = NIL
+                if self.min == NIL:
+                    self.min = n
+                else:
+                    self._add_node_left(n, self.min)
+                    if key[n] < key[self.min]:
+                        self.min = n
+
+    # Delete the given handles, the parent of every node is given too.
+    # Their other children become roots, and the roots are consolidated
+    # once. The keys and the values of the handles stay readable until
+    # the next insert or delete.
+    # Amortized time complexity: O(m + log n), m is the amount of nodes
+    def _delete_nodes(self, nodes):
+        if self._released:
+            self._clear_released()
+        if not nodes:
+            return
+        removed = set(nodes)
+        child = self._child
+        roots = [r for r in self._siblings(self.min) if r not in removed]
+        for n in nodes:
+            if child[n] != NIL:
+                roots.extend(c for c in self._siblings(child[n]) if c not in removed)
+
+        self.no_nodes -= len(nodes)
+        for n in nodes:
+            child[n] = NIL
+            self._degree[n] = 0
+        self._released.extend(nodes)
+
+        if not roots:
+            self.min = NIL
+            return
+
+        # make the new root layer and consolidate it
+        parent = self._parent
+        left = self._left
+        right = self._right
+        flag = self._flag
+        prev = roots[-1]
+        for r in roots:
+            parent[r] = NIL
+            flag[r] = 0
+            right[prev] = r
+            left[r] = prev
+            prev = r
+        self.min = roots[0]
+        self._consolidate()
+
+    # Decrease the value of the key of the given nodes.
+    # new_key must lower than current key value.
+    # Return the handle of the updated node.
+    # Amortized time complexity: O(1)
+    def decrease_key(self, node, new_key):
+        key = self._key
+        assert (
+            key[node] > new_key
+        ), "The new_key must be lower than current when decreasing key."
+
+        key[node] = new_key
+        parent = self._parent[node]
+
+        # root element, simple case
+        if parent == NIL:
+            if new_key < key[self.min]:
+                self.min = node
+        # otherwise
+        elif new_key < key[parent]:
+            self._cut(node)
+            self._cascading_cut(parent)
+
+        return node
+
+    # Move the node root level
+    def _cut(self, node):
+        parent = self._parent[node]
+        self._degree[parent] -= 1
+
+        # if parent has only 1 child
+        if self._child[parent] == node and self._right[node] == node:
+            self._child[parent] = NIL
+        else:
+            self._child[parent] = self._right[node]
+        self._remove_node(node)
+
+        # add to the root level
+        self._flag[node] = 0
+        self._add_node_left(node, self.min)
+        if self._key[node] < self._key[self.min]:
+            self.min = node
+
+    # Reorganize the heap to keep it in optimal form
+    def _cascading_cut(self, node):
+        parent = self._parent[node]
+        while parent != NIL:
+            if not self._flag[parent]:
+                self._flag[parent] = 1
+                return
+            self._cut(node)
+            node = parent
+            parent = self._parent[node]
+
+    # Merge another heap into this heap.
+    # The handles of the given heap are moved by the returned offset,
+    # so its handle h is handle h + offset in this heap. The given heap
+    # is emptied, so its old handles raise IndexError there.
+    # Time complexity: O(m), m is the size of the given heap
+    def merge(self, heap):
+        assert isinstance(heap, ArrayFibonacciHeap)
+        assert heap is not self, "A heap cannot be merged into itself."
+        heap._clear_released()
+        offset = len(self._key)
+
+        def moved(column):
+            return array(LINK, (p if p == NIL else p + offset for p in column))
+
+        self._key.extend(heap._key)
+        self._val.extend(heap._val)
+        self._parent.extend(moved(heap._parent))
+        self._child.extend(moved(heap._child))
+        self._left.extend(moved(heap._left))
+        self._right.extend(moved(heap._right))
+        self._degree.extend(heap._degree)
+        self._flag.extend(heap._flag)
+        self._free.extend(moved(heap._free))
+
+        if heap.min != NIL:
+            other_min = heap.min + offset
+            if self.min == NIL:
+                self.min = other_min
+            else:
+                # move given root layer between min and min.right
+                first = self.min
+                last = self._right[first]
+                second_last = self._left[other_min]
+
+                self._right[first] = other_min
+                self._left[other_min] = first
+                self._left[last] = second_last
+                self._right[second_last] = last
+
+                if self._key[other_min] < self._key[self.min]:
+                    self.min = other_min
+
+        self.no_nodes += heap.no_nodes
+        heap.__init__()
+        return offset
+
+    # Iterate over the handles, every tree layer at a time
+    def _nodes(self):
+        if self.min == NIL:
+            return
+        child = self._child
+        right = self._right
+        stack = [self.min]
+        while stack:
+            n = stop = stack.pop()
+            first_loop = True
+            while first_loop or n != stop:
+                first_loop = False
+                yield n
+                if child[n] != NIL:
+                    stack.append(child[n])
+                n = right[n]
+
+    # Iterate over the roots
+    def _roots(self):
+        if self.min == NIL:
+            return []
+        return self._siblings(self.min)
+
+    # Iterate over the children of the node
+    def _children(self, node):
+        if self._child[node] == NIL:
+            return []
+        return self._siblings(self._child[node])
+
+    # Iterate over the circular list of the node
+    def _siblings(self, node):
+        right = self._right
+        n = node
+        while True:
+            yield n
+            n = right[n]
+            if n == node:
+                return
+
+    # Drop the keys and the values of the released handles, so they are
+    # not kept alive, and free the slots
+    def _clear_released(self):
+        key = self._key
+        val = self._val
+        for n in self._released:
+            key[n] = val[n] = None
+        self._free.extend(self._released)
+        del self._released[:]
+
+    # Allocate a slot for a new node, reuse a free one if possible
+    def _new_node(self, key, value):
+        if self._released:
+            self._clear_released()
+        if self._free:
+            n = self._free.pop()
+            self._key[n] = key
+            self._val[n] = value
+            self._parent[n] = self._child[n] = NIL
+            self._left[n] = self._right[n] = n
+            self._degree[n] = 0
+            self._flag[n] = 0
+        else:
+            n = len(self._key)
+            self._key.append(key)
+            self._val.append(value)
+            self._parent.append(NIL)
+            self._child.append(NIL)
+            self._left.append(n)
+            self._right.append(n)
+            self._degree.append(0)
+            self._flag.append(0)
+        return n
+
+    # Move the children of the node to the root level
+    def _move_children_to_root(self, node):
+        c = self._child[node]
+        if c == NIL:
+            return
+        parent = self._parent
+        right = self._right
+        n = c
+        first_loop = True
+        while first_loop or n != c:
+            first_loop = False
+            next_node = right[n]
+            self._add_node_left(n, self.min)
+            parent[n] = NIL
+            self._flag[n] = 0
+            n = next_node
+        self._child[node] = NIL
+        self._degree[node] = 0
+
+    # Add node to left side of the given right_node
+    def _add_node_left(self, node, right_node):
+        left = self._left
+        right = self._right
+        right[node] = right_node
+        left[node] = left[right_node]
+        right[left[right_node]] = node
+        left[right_node] = node
+
+    # Add node to the root layer
+    def _add_root(self, node):
+        self._add_node_left(node, self.min)
+        if self._key[node] < self._key[self.min]:
+            self.min = node
+
+    # Add node as child to another node
+    def _add_child(self, child, parent):
+        if self._child[parent] == NIL:
+            self._child[parent] = child
+        else:
+            self._add_node_left(child, self._child[parent])
+        self._parent[child] = parent
+        self._degree[parent] += 1
+
+    # Remove element from the double linked list
+    def _remove_node(self, node):
+        left = self._left
+        right = self._right
+        right[left[node]] = right[node]
+        left[right[node]] = left[node]
+        left[node] = node
+        right[node] = node
+        self._parent[node] = NIL
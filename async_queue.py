@@ -0,0 +1,83 @@
+import asyncio
+from hollow_heap import HollowHeap
+
+# asyncio priority queue on top of a heap engine.
+#
+# It has the interface of asyncio.PriorityQueue: the items are
+# (key, value) pairs and the smallest key comes out first. put and
+# put_nowait return a handle of the item, which can change the key of a
+# waiting item or cancel it.
+#
+#   queue = AsyncPriorityQueue()
+#   job = await queue.put((5, "report"))
+#   queue.reprioritize(job, 1)  # O(1) with HollowHeap
+#   key, value = await queue.get()
+#   queue.task_done()
+
+
+class AsyncPriorityQueue(asyncio.Queue):
+    # heap_type is the engine, HollowHeap by default
+    def __init__(self, maxsize=0, heap_type=HollowHeap):
+        self._heap_type = heap_type
+        super().__init__(maxsize)
+
+    # Put the item to the queue, wait if the queue is full.
+    # Return the handle of the item.
+    async def put(self, item):
+        await super().put(item)
+        return self._last
+
+    # Put the item to the queue, raise QueueFull if it is full.
+    # Return the handle of the item.
+    def put_nowait(self, item):
+        super().put_nowait(item)
+        return self._last
+
+    # Amount of the items in the queue
+    def qsize(self):
+        return self._heap.no_nodes
+
+    def empty(self):
+        return self._heap.no_nodes == 0
+
+    # Change the key of a waiting item.
+    # Return False if the item has already left the queue.
+    # Time complexity: the update_key of the engine, O(1) for a lower key
+    def reprioritize(self, handle, key):
+        if handle.node is None:
+            return False
+        handle.node = self._heap.update_key(handle.node, key)
+        return True
+
+    # Remove a waiting item from the queue. It counts as a finished task.
+    # Return False if the item has already left the queue.
+    # Time complexity: the delete of the engine, O(1) for HollowHeap
+    def cancel(self, handle):
+        if handle.node is None:
+            return False
+        self._heap.delete(handle.node)
+        handle.node = None
+        self.task_done()
+        self._wakeup_next(self._putters)
+        return True
+
+    # the storage hooks of asyncio.Queue
+
+    def _init(self, maxsize):
+        self._heap = self._heap_type()
+        self._last = None  # the handle of the last put item
+
+    def _put(self, item):
+        key, value = item
+        heap = self._heap
+        # the value is kept with its handle, so that get can
+        # mark the handle as gone
+        entry = [value, None]
+        entry[1] = self._last = heap.handle(heap.insert(key, entry))
+
+    def _get(self):
+        heap = self._heap
+        node = heap.delete_min()
+        value, handle = heap.value(node)
+        handle.node = None
+        return heap.key(node), value
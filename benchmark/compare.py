@@ -0,0 +1,110 @@
+# Compare memory use and throughput of the heap engines.
+#
+# Run from the repository root:
+# > python -m benchmark.compare [n]
+
+import random
+import sys
+import time
+import tracemalloc
+from fibonacci_heap import FibonacciHeap
+from hollow_heap import HollowHeap
+from array_fibonacci_heap import ArrayFibonacciHeap
+from dary_heap import DaryHeap
+from pairing_heap import PairingHeap
+
+ENGINES = [
+    ("FibonacciHeap", FibonacciHeap),
+    ("FibonacciHeap pooled", lambda: FibonacciHeap(pool_size=1024)),
+    ("ArrayFibonacciHeap", ArrayFibonacciHeap),
+    ("HollowHeap", HollowHeap),
+    ("HollowHeap pooled", lambda: HollowHeap(pool_size=1024)),
+    ("DaryHeap", DaryHeap),
+    ("PairingHeap", PairingHeap),
+]
+
+
+# Return the traced bytes per node of a heap holding n nodes.
+def bytes_per_node(heap_type, n):
+    keys = [random.random() for _ in range(n)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    heap = heap_type()
+    handles = [heap.insert(k) for k in keys]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del heap, handles
+    return (after - before) / n
+
+
+# Return operations per second of a mixed workload:
+# n inserts, n / 2 decrease_keys and n delete_mins.
+def ops_per_sec(heap_type, n):
+    keys = [random.random() for _ in range(n)]
+    start = time.perf_counter()
+    heap = heap_type()
+    handles = [heap.insert(k) for k in keys]
+    for i in range(0, n, 2):
+        handles[i] = heap.decrease_key(handles[i], heap.key(handles[i]) - 1)
+    for _ in range(n):
+        heap.delete_min()
+    elapsed = time.perf_counter() - start
+    return (n + n // 2 + n) / elapsed
+
+
+# Return operations per second of a steady decrease-heavy workload:
+# a heap of n nodes where every round does two decrease_keys,
+# one delete_min and one insert.
+def decrease_ops_per_sec(heap_type, n):
+    heap = heap_type()
+    handles = [heap.insert(random.random(), i) for i in range(n)]
+    start = time.perf_counter()
+    for _ in range(n):
+        for _ in range(2):
+            i = random.randrange(n)
+            handles[i] = heap.decrease_key(handles[i], heap.key(handles[i]) - 1)
+        i = heap.value(heap.find_min())
+        heap.delete_min()
+        handles[i] = heap.insert(random.random(), i)
+    elapsed = time.perf_counter() - start
+    return 4 * n / elapsed
+
+
+# Return delete_mins per second. Only the delete_mins are timed,
+# the heap is built and shaken with decrease_keys before it.
+def delete_min_per_sec(heap_type, n):
+    heap = heap_type()
+    handles = [heap.insert(random.random()) for _ in range(n)]
+    heap.delete_min()
+    for i in random.sample(range(n), n // 10):
+        handles[i] = heap.decrease_key(handles[i], heap.key(handles[i]) - 1)
+    start = time.perf_counter()
+    for _ in range(n - 1):
+        heap.delete_min()
+    elapsed = time.perf_counter() - start
+    return (n - 1) / elapsed
+
+
+def main(n):
+    print(f"n = {n}")
+    print(
+        f"{'engine':<24}{'bytes/node':>12}{'ops/sec':>14}"
+        f"{'decrease ops/sec':>18}{'delete_min/sec':>16}"
+    )
+    for name, heap_type in ENGINES:
+        random.seed(1)
+        memory = bytes_per_node(heap_type, n)
+        random.seed(1)
+        speed = ops_per_sec(heap_type, n)
+        random.seed(1)
+        decrease_speed = decrease_ops_per_sec(heap_type, n)
+        random.seed(1)
+        delete_speed = delete_min_per_sec(heap_type, n)
+        print(
+            f"{name:<24}{memory:>12.1f}{speed:>14.0f}"
+            f"{decrease_speed:>18.0f}{delete_speed:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,449 @@
+# Workload benchmarks for every heap engine and the standard heapq.
+#
+# Run from the repository root:
+# > python -m benchmark.suite --sizes 1000 10000 100000 --output results.json
+#
+# The results are written as JSON:
+# {
+#   "format": 1,
+#   "python": "3.11.7",
+#   "results": [
+#     {"workload": "dijkstra_sparse", "engine": "HollowHeap", "n": 1000,
+#      "ops": 4123, "wall_time": 0.01, "ops_per_sec": 412300.0,
+#      "gc_time": 0.0, "peak_memory": 123456},
+#     ...
+#   ]
+# }
+# The results are ordered by workload, engine and n. peak_memory is in
+# bytes, and null if memory was not measured.
+#
+# Give --baseline old.json to compare ops_per_sec against an earlier run.
+# The exit code is 1 if any result is slower than the tolerance allows.
+
+import argparse
+import gc
+import heapq
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+import abstract_heap
+from fibonacci_heap import FibonacciHeap
+from hollow_heap import HollowHeap
+from pairing_heap import PairingHeap
+from dary_heap import DaryHeap
+from array_fibonacci_heap import ArrayFibonacciHeap
+from radix_heap import RadixHeap
+
+FORMAT_VERSION = 1
+
+
+class _HeapqNode(abstract_heap.HeapNode):
+    __slots__ = ("key", "val", "removed")
+
+    def __init__(self, key, val):
+        self.key = key
+        self.val = val
+        self.removed = False
+
+
+# The standard heapq behind the Heap interface.
+# delete and decrease_key mark the old entry removed, and removed
+# entries are skipped when they reach the top.
+class HeapqHeap(abstract_heap.Heap):
+    def __init__(self):
+        self.entries = []
+        self.counter = itertools.count()  # breaks ties without comparing nodes
+        self.no_nodes = 0
+
+    def find_min(self):
+        entries = self.entries
+        while entries and entries[0][2].removed:
+            heapq.heappop(entries)
+        return entries[0][2] if entries else None
+
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        n = _HeapqNode(key, value)
+        heapq.heappush(self.entries, (key, next(self.counter), n))
+        self.no_nodes += 1
+        return n
+
+    def delete(self, node):
+        node.removed = True
+        self.no_nodes -= 1
+
+    def delete_min(self):
+        entries = self.entries
+        while entries:
+            n = heapq.heappop(entries)[2]
+            if not n.removed:
+                n.removed = True
+                self.no_nodes -= 1
+                return n
+        return None
+
+    def decrease_key(self, node, new_key):
+        assert (
+            node.key > new_key
+        ), "The new_key must be lower than current when decreasing key."
+        node.removed = True
+        self.no_nodes -= 1
+        return self.insert(new_key, node.val)
+
+    def merge(self, heap):
+        assert isinstance(heap, HeapqHeap)
+        self.entries.extend(
+            (n.key, next(self.counter), n) for _, _, n in heap.entries if not n.removed
+        )
+        heapq.heapify(self.entries)
+        self.no_nodes += heap.no_nodes
+
+
+# name -> heap type, in the order of the results
+ENGINES = {
+    "FibonacciHeap": FibonacciHeap,
+    "HollowHeap": HollowHeap,
+    "PairingHeap": PairingHeap,
+    "DaryHeap": DaryHeap,
+    "ArrayFibonacciHeap": ArrayFibonacciHeap,
+    "RadixHeap": RadixHeap,
+    "heapq": HeapqHeap,
+}
+
+# engines which only work when the keys are monotone integers
+MONOTONE_ENGINES = {"RadixHeap"}
+
+
+# Return a random graph with n vertices as CSR arrays
+# (indptr, indices, weights). Every vertex has degree random out edges
+# and an edge to the next vertex, so all vertices are reachable from 0.
+def _random_graph(n, degree, rng, undirected=False, int_weights=True):
+    edges = []
+    for u in range(n):
+        targets = [rng.randrange(n) for _ in range(degree)]
+        if u + 1 < n:
+            targets.append(u + 1)
+        for v in targets:
+            w = rng.randint(1, 100) if int_weights else rng.random()
+            edges.append((u, v, w))
+            if undirected:
+                edges.append((v, u, w))
+
+    # counting sort the edges by the source vertex
+    indptr = array("q", [0] * (n + 1))
+    for u, _, _ in edges:
+        indptr[u + 1] += 1
+    for u in range(n):
+        indptr[u + 1] += indptr[u]
+    position = array("q", indptr[:-1])
+    indices = array("q", [0] * len(edges))
+    weights = array("q" if int_weights else "d", [0] * len(edges))
+    for u, v, w in edges:
+        i = position[u]
+        indices[i] = v
+        weights[i] = w
+        position[u] += 1
+    return indptr, indices, weights
+
+
+# Shortest path distances from the vertex 0 with decrease_key.
+def _dijkstra(heap_type, graph):
+    indptr, indices, weights = graph
+    heap = heap_type()
+    key, value = heap.key, heap.value
+    handles = [None] * (len(indptr) - 1)
+    done = bytearray(len(indptr) - 1)
+    handles[0] = heap.insert(0, 0)
+    ops = 1
+    while heap.no_nodes:
+        h = heap.delete_min()
+        u, d = value(h), key(h)
+        done[u] = 1
+        ops += 1
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if done[v]:
+                continue
+            new_key = d + weights[i]
+            hv = handles[v]
+            if hv is None:
+                handles[v] = heap.insert(new_key, v)
+            elif new_key < key(hv):
+                handles[v] = heap.decrease_key(hv, new_key)
+            else:
+                continue
+            ops += 1
+    return ops
+
+
+# Minimum spanning tree from the vertex 0 with decrease_key.
+def _prim(heap_type, graph):
+    indptr, indices, weights = graph
+    heap = heap_type()
+    key, value = heap.key, heap.value
+    handles = [None] * (len(indptr) - 1)
+    done = bytearray(len(indptr) - 1)
+    handles[0] = heap.insert(0.0, 0)
+    ops = 1
+    while heap.no_nodes:
+        u = value(heap.delete_min())
+        done[u] = 1
+        ops += 1
+        for i in range(indptr[u], indptr[u + 1]):
+            v = indices[i]
+            if done[v]:
+                continue
+            hv = handles[v]
+            if hv is None:
+                handles[v] = heap.insert(weights[i], v)
+            elif weights[i] < key(hv):
+                handles[v] = heap.decrease_key(hv, weights[i])
+            else:
+                continue
+            ops += 1
+    return ops
+
+
+# Discrete-event simulation. Every fired event schedules a new one,
+# until n events have been scheduled, and a third of the events are
+# cancelled before they fire.
+def _simulation(heap_type, data):
+    n, delays, cancels = data
+    heap = heap_type()
+    handles = []
+    pending = []  # ids of the pending events
+    position = []  # index of an event in pending
+    ops = 0
+
+    def schedule(at):
+        position.append(len(pending))
+        pending.append(len(handles))
+        handles.append(heap.insert(at, len(handles)))
+
+    def forget(event):
+        i = position[event]
+        last = pending.pop()
+        if last != event:
+            pending[i] = last
+            position[last] = i
+
+    for i in range(min(n, 1000)):
+        schedule(delays[i])
+        ops += 1
+    now = 0
+    while pending:
+        if cancels[ops % len(cancels)] and len(pending) > 1:
+            event = pending[ops % len(pending)]
+            forget(event)
+            heap.delete(handles[event])
+        else:
+            h = heap.delete_min()
+            now = heap.key(h)
+            forget(heap.value(h))
+        ops += 1
+        if len(handles) < n:
+            schedule(now + delays[len(handles)])
+            ops += 1
+    return ops
+
+
+# Heap sort: insert everything, then delete the min until empty.
+def _sort(heap_type, keys):
+    heap = heap_type()
+    for k in keys:
+        heap.insert(k)
+    for _ in keys:
+        heap.delete_min()
+    return 2 * len(keys)
+
+
+# Join many small sorted inputs: build a heap per input, merge them all,
+# and read the smallest tenth of the keys.
+def _merge_join(heap_type, parts):
+    heap = heap_type()
+    ops = 0
+    for part in parts:
+        other = heap_type()
+        for k in part:
+            other.insert(k)
+        heap.merge(other)
+        ops += len(part) + 1
+    for _ in range(sum(len(p) for p in parts) // 10):
+        heap.delete_min()
+        ops += 1
+    return ops
+
+
+def _prepare_dijkstra_sparse(n, rng):
+    return _random_graph(n, 4, rng)
+
+
+def _prepare_dijkstra_dense(n, rng):
+    return _random_graph(n, min(n, 32), rng)
+
+
+def _prepare_prim(n, rng):
+    return _random_graph(n, 4, rng, undirected=True, int_weights=False)
+
+
+def _prepare_simulation(n, rng):
+    delays = [rng.randint(1, 1000) for _ in range(n)]
+    cancels = [rng.random() < 1 / 3 for _ in range(1009)]
+    return n, delays, cancels
+
+
+def _prepare_sort(n, rng):
+    return [rng.randrange(n * 10) for _ in range(n)]
+
+
+def _prepare_merge_join(n, rng):
+    size = 100
+    return [
+        [rng.randrange(n * 10) for _ in range(min(size, n - i))]
+        for i in range(0, n, size)
+    ]
+
+
+# name -> (prepare input, run, monotone integer keys)
+WORKLOADS = {
+    "dijkstra_sparse": (_prepare_dijkstra_sparse, _dijkstra, True),
+    "dijkstra_dense": (_prepare_dijkstra_dense, _dijkstra, True),
+    "prim": (_prepare_prim, _prim, False),
+    "simulation": (_prepare_simulation, _simulation, True),
+    "sort": (_prepare_sort, _sort, True),
+    "merge_join": (_prepare_merge_join, _merge_join, True),
+}
+
+
+# Run the workload once and return its result row.
+def measure(workload, engine, n, seed=1, memory=True):
+    prepare, run, _ = WORKLOADS[workload]
+    heap_type = ENGINES[engine]
+    data = prepare(n, random.Random(seed))
+
+    gc_time = 0.0
+    gc_start = 0.0
+
+    def gc_callback(phase, info):
+        nonlocal gc_time, gc_start
+        if phase == "start":
+            gc_start = time.perf_counter()
+        else:
+            gc_time += time.perf_counter() - gc_start
+
+    gc.collect()
+    gc.callbacks.append(gc_callback)
+    try:
+        start = time.perf_counter()
+        ops = run(heap_type, data)
+        wall_time = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(gc_callback)
+
+    # tracing slows the run down, so memory is measured on its own run
+    peak_memory = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(heap_type, data)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "workload": workload,
+        "engine": engine,
+        "n": n,
+        "ops": ops,
+        "wall_time": wall_time,
+        "ops_per_sec": ops / wall_time,
+        "gc_time": gc_time,
+        "peak_memory": peak_memory,
+    }
+
+
+# Run every combination and return the results as a JSON compatible dict.
+def run_suite(workloads, engines, sizes, seed=1, memory=True, log=None):
+    results = []
+    for workload in workloads:
+        monotone = WORKLOADS[workload][2]
+        for engine in engines:
+            if engine in MONOTONE_ENGINES and not monotone:
+                continue
+            for n in sorted(sizes):
+                if log is not None:
+                    print(f"{workload} {engine} n={n}", file=log)
+                results.append(measure(workload, engine, n, seed, memory))
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+# Return the results which are slower than the baseline by more than
+# the tolerance, as (result, baseline result) pairs.
+def find_regressions(results, baseline, tolerance):
+    def row_id(r):
+        return r["workload"], r["engine"], r["n"]
+
+    old = {row_id(r): r for r in baseline["results"]}
+    regressions = []
+    for r in results["results"]:
+        b = old.get(row_id(r))
+        if b is not None and r["ops_per_sec"] < b["ops_per_sec"] * (1 - tolerance):
+            regressions.append((r, b))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Heap workload benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS))
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--baseline", help="JSON of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.workloads,
+        args.engines,
+        args.sizes,
+        args.seed,
+        not args.no_memory,
+        log=sys.stderr,
+    )
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for r, b in regressions:
+            print(
+                f"REGRESSION {r['workload']} {r['engine']} n={r['n']}: "
+                f"{r['ops_per_sec']:.0f} ops/sec, was {b['ops_per_sec']:.0f}",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
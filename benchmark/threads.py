@@ -0,0 +1,109 @@
+# Scaling of the concurrent queues with the amount of threads.
+#
+# Every thread does rounds of one insert and one delete_min on a shared
+# queue. The queues are a HollowHeap behind a single lock, and MultiQueue
+# in relaxed and strict mode. With the GIL the threads cannot run at the
+# same time, a free-threaded build (python3.13t) shows the real scaling.
+# Sub-interpreters cannot share a queue, so where they are available
+# their row is the shared-nothing bound: every interpreter runs the same
+# rounds on its own HollowHeap.
+#
+# Run from the repository root:
+# > python -m benchmark.threads [rounds per thread]
+
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hollow_heap import HollowHeap
+from multi_queue import MultiQueue
+
+THREADS = [1, 2, 4, 8]
+
+
+# HollowHeap behind one lock, the baseline
+class LockedHeap:
+    def __init__(self):
+        self._heap = HollowHeap()
+        self._lock = threading.Lock()
+
+    def insert(self, key, value=None):
+        with self._lock:
+            self._heap.insert(key, value)
+
+    def delete_min(self):
+        with self._lock:
+            heap = self._heap
+            n = heap.delete_min()
+            return None if n is None else (heap.key(n), heap.value(n))
+
+
+QUEUES = [
+    ("locked HollowHeap", LockedHeap),
+    ("MultiQueue", lambda: MultiQueue(seed=1)),
+    ("MultiQueue strict", lambda: MultiQueue(strict=True, seed=1)),
+]
+
+
+# Run the rounds of one thread
+def _rounds(queue, rounds, seed):
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        queue.insert(rng.random())
+        queue.delete_min()
+
+
+# Run the rounds on an own heap, for the sub-interpreters
+def _own_rounds(rounds, seed):
+    _rounds(LockedHeap(), rounds, seed)
+
+
+# Return operations per second of the given amount of threads
+def ops_per_sec(queue_type, threads, rounds):
+    queue = queue_type()
+    rng = random.Random(1)
+    for _ in range(1000):
+        queue.insert(rng.random())
+
+    with ThreadPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(_rounds, queue, rounds, t) for t in range(threads)]
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - start
+    return 2 * rounds * threads / elapsed
+
+
+# Return operations per second of the given amount of sub-interpreters,
+# or None if they are not available
+def interpreter_ops_per_sec(threads, rounds):
+    try:
+        from concurrent.futures import InterpreterPoolExecutor
+    except ImportError:
+        return None
+
+    with InterpreterPoolExecutor(threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(_own_rounds, rounds, t) for t in range(threads)]
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - start
+    return 2 * rounds * threads / elapsed
+
+
+def main(rounds):
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"rounds per thread = {rounds}, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'queue':<24}" + "".join(f"{f'{t} threads':>14}" for t in THREADS))
+    for name, queue_type in QUEUES:
+        speeds = [ops_per_sec(queue_type, t, rounds) for t in THREADS]
+        print(f"{name:<24}" + "".join(f"{s:>14.0f}" for s in speeds))
+
+    speeds = [interpreter_ops_per_sec(t, rounds) for t in THREADS]
+    if speeds[0] is not None:
+        print(f"{'sub-interpreters':<24}" + "".join(f"{s:>14.0f}" for s in speeds))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,137 @@
+# Compare timer schedulers when most timers are cancelled.
+#
+# Every engine schedules n timers at random times, cancels a share of
+# them in random order while the virtual clock moves on, and fires the
+# rest. The schedulers are Scheduler on the heap engines, the standard
+# sched module, whose cancel is O(n), and heapq with lazy cancellation,
+# where a cancelled entry is only flagged and skipped when it comes up.
+# The sched run grows quadratically, it takes half a minute with n = 20000.
+#
+# Run from the repository root:
+# > python -m benchmark.timers [n] [cancel ratio]
+
+import heapq
+import random
+import sched
+import sys
+import time
+from fibonacci_heap import FibonacciHeap
+from hollow_heap import HollowHeap
+from pairing_heap import PairingHeap
+from scheduler import Scheduler, VirtualClock
+
+
+def _nothing():
+    pass
+
+
+# Scheduler on a heap engine
+def _run_scheduler(heap_type, plan):
+    clock = VirtualClock()
+    scheduler = Scheduler(clock, heap_type)
+    timers = []
+    fired = 0
+    for op, arg in plan:
+        if op == "schedule":
+            timers.append(scheduler.schedule(arg, _nothing))
+        elif op == "cancel":
+            scheduler.cancel(timers[arg])
+        else:
+            clock.now = arg
+            fired += scheduler.run_due()
+    return fired
+
+
+# The standard sched module
+def _run_sched(plan):
+    clock = VirtualClock()
+    s = sched.scheduler(clock, lambda dt: None)
+    events = []
+    fired = [0]
+
+    def count():
+        fired[0] += 1
+
+    for op, arg in plan:
+        if op == "schedule":
+            events.append(s.enterabs(arg, 0, count))
+        elif op == "cancel":
+            s.cancel(events[arg])
+        else:
+            clock.now = arg
+            s.run(blocking=False)
+    return fired[0]
+
+
+# heapq with cancelled entries flagged and skipped
+def _run_heapq(plan):
+    queue = []
+    entries = []
+    fired = 0
+    for op, arg in plan:
+        if op == "schedule":
+            entry = [arg, len(entries), _nothing]
+            entries.append(entry)
+            heapq.heappush(queue, entry)
+        elif op == "cancel":
+            entries[arg][2] = None
+        else:
+            while queue and queue[0][0] <= arg:
+                callback = heapq.heappop(queue)[2]
+                if callback is not None:
+                    callback()
+                    fired += 1
+    return fired
+
+
+RUNNERS = [
+    ("Scheduler HollowHeap", lambda plan: _run_scheduler(HollowHeap, plan)),
+    ("Scheduler FibonacciHeap", lambda plan: _run_scheduler(FibonacciHeap, plan)),
+    ("Scheduler PairingHeap", lambda plan: _run_scheduler(PairingHeap, plan)),
+    ("heapq lazy cancel", _run_heapq),
+    ("sched", _run_sched),
+]
+
+
+# Return the operations: n timers in [0, n), the given share of them is
+# cancelled before the clock reaches them, and the clock moves in 100
+# steps
+def make_plan(n, cancel_ratio, seed=1):
+    rng = random.Random(seed)
+    times = [rng.uniform(0, n) for _ in range(n)]
+    plan = [("schedule", t) for t in times]
+
+    # cancel the timers in random order between the clock steps,
+    # at the latest just before they would fire
+    cancelled = [i for i in range(n) if rng.random() < cancel_ratio]
+    rng.shuffle(cancelled)
+    steps = 100
+    for step in range(1, steps + 1):
+        now = n * step / steps
+        remaining = []
+        for i in cancelled:
+            if times[i] <= now or rng.random() < 0.5:
+                plan.append(("cancel", i))
+            else:
+                remaining.append(i)
+        cancelled = remaining
+        plan.append(("run", now))
+    return plan
+
+
+def main(n, cancel_ratio):
+    plan = make_plan(n, cancel_ratio)
+    print(f"n = {n}, cancel ratio = {cancel_ratio}")
+    print(f"{'scheduler':<26}{'seconds':>10}{'fired':>10}")
+    for name, run in RUNNERS:
+        start = time.perf_counter()
+        fired = run(plan)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26}{elapsed:>10.3f}{fired:>10}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.9,
+    )
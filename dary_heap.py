@@ -0,0 +1,183 @@
+import abstract_heap as heap
+
+
+class _Node(heap.HeapNode):
+    __slots__ = ("key", "val", "index")
+
+    def __init__(self, key, val):
+        self.key = key
+        self.val = val
+        self.index = 0  # position in the array of the heap
+
+
+# Implementation of an indexed d-ary heap.
+# The nodes are kept in an array and every node knows its position,
+# so a node can be updated or deleted without searching it.
+# https://en.wikipedia.org/wiki/D-ary_heap
+class DaryHeap(heap.Heap):
+    def __init__(self, d=4):
+        assert d >= 2, "The heap needs at least 2 children per node."
+        self.d = d
+        self.nodes = []
+
+    # Amount of the nodes in the heap
+    @property
+    def no_nodes(self):
+        return len(self.nodes)
+
+    # Return the minimum node.
+    # Time complexity: O(1)
+    def find_min(self):
+        return self.nodes[0] if self.nodes else None
+
+    # Insert new item as a node to the heap.
+    # Can be called with key (key) or value and key (key, value).
+    # Return the node.
+    # Time complexity: O(log n)
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        n = _Node(key, value)
+        n.index = len(self.nodes)
+        self.nodes.append(n)
+        self._sift_up(n)
+        return n
+
+    # Delete the given node.
+    # Time complexity: O(log n)
+    def delete(self, node):
+        last = self.nodes.pop()
+        if last is not node:
+            # fill the hole with the last node
+            last.index = node.index
+            self.nodes[node.index] = last
+            if last.key < node.key:
+                self._sift_up(last)
+            else:
+                self._sift_down(last)
+
+    # Delete and returns the minimum node.
+    # Time complexity: O(log n)
+    def delete_min(self):
+        if not self.nodes:
+            return None
+        prev_min = self.nodes[0]
+        self.delete(prev_min)
+        return prev_min
+
+    # Decrease the value of the key of the given nodes.
+    # new_key must lower than current key value.
+    # Return the updated node.
+    # Time complexity: O(log n)
+    def decrease_key(self, node, new_key):
+        assert (
+            node.key > new_key
+        ), "The new_key must be lower than current when decreasing key."
+        node.key = new_key
+        self._sift_up(node)
+        return node
+
+    # Change the key of the given node to any new key.
+    # Return the updated node.
+    # Time complexity: O(log n)
+    def update_key(self, node, new_key):
+        if new_key < node.key:
+            node.key = new_key
+            self._sift_up(node)
+        else:
+            node.key = new_key
+            self._sift_down(node)
+        return node
+
+    # Merge another heap into this heap.
+    # The nodes of the given heap are moved to this heap.
+    # Time complexity: O(n + m), or O(m log(n + m)) if m is small
+    def merge(self, heap):
+        assert isinstance(heap, DaryHeap)
+        nodes = heap.nodes
+        heap.nodes = []
+        if len(nodes) * 8 < len(self.nodes):
+            for n in nodes:
+                n.index = len(self.nodes)
+                self.nodes.append(n)
+                self._sift_up(n)
+        else:
+            self.nodes.extend(nodes)
+            self._heapify()
+
+    # Insert many items to the heap.
+    # items are keys, or (key, value) pairs if pairs is True.
+    # Return the nodes in input order.
+    # Time complexity: O(n + m)
+    def insert_many(self, items, pairs=False):
+        if not pairs:
+            items = ((key, None) for key in items)
+        nodes = [_Node(key, key if value is None else value) for key, value in items]
+        self.nodes.extend(nodes)
+        self._heapify()
+        return nodes
+
+    # Iterate over the nodes in array order
+    def _nodes(self):
+        return iter(self.nodes)
+
+    # Iterate over the root
+    def _roots(self):
+        return self.nodes[:1]
+
+    # Iterate over the children of the node
+    def _children(self, node):
+        first = node.index * self.d + 1
+        return self.nodes[first : first + self.d]
+
+    # Restore the heap order of the whole array, bottom-up
+    def _heapify(self):
+        nodes = self.nodes
+        for i, n in enumerate(nodes):
+            n.index = i
+        for i in reversed(range((len(nodes) - 2) // self.d + 1)):
+            self._sift_down(nodes[i])
+
+    # Move the node up until its parent is not larger
+    def _sift_up(self, node):
+        nodes = self.nodes
+        d = self.d
+        key = node.key
+        i = node.index
+        while i > 0:
+            parent_index = (i - 1) // d
+            parent = nodes[parent_index]
+            if not key < parent.key:
+                break
+            nodes[i] = parent
+            parent.index = i
+            i = parent_index
+        nodes[i] = node
+        node.index = i
+
+    # Move the node down until its children are not smaller
+    def _sift_down(self, node):
+        nodes = self.nodes
+        d = self.d
+        size = len(nodes)
+        key = node.key
+        i = node.index
+        while True:
+            first = i * d + 1
+            if first >= size:
+                break
+
+            # find the smallest child
+            smallest = nodes[first]
+            for c in range(first + 1, min(first + d, size)):
+                if nodes[c].key < smallest.key:
+                    smallest = nodes[c]
+            if not smallest.key < key:
+                break
+
+            nodes[i] = smallest
+            j = smallest.index
+            smallest.index = i
+            i = j
+        nodes[i] = node
+        node.index = i
@@ -0,0 +1,242 @@
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+from operator import itemgetter
+from hollow_heap import HollowHeap
+
+# Priority queue for more items than fit in memory.
+#
+# The smallest items, the frontier, are kept in a heap of any engine with
+# at most memory_items items. When the frontier is full, its larger half
+# is sorted and spilled to a run file on disk. delete_min takes the
+# smaller of the frontier min and the smallest head of the runs, and the
+# runs are streamed back block by block through an mmap of the file.
+#
+#   with ExternalHeap(memory_items=1000000) as heap:
+#       heap.insert(3, "C")
+#       heap.delete_min()  # -> (3, "C")
+#       heap.io_stats()    # -> {"bytes_written": ..., ...}
+#
+# The items on disk cannot be found by a node, so there is no
+# decrease_key or delete.
+#
+# The runs are tiered: a spilled run is on level 0, and when a level has
+# max_runs runs, they are merged to one run on the next level. An item is
+# rewritten O(log(N / M)) times, with the base max_runs, and there are
+# at most max_runs - 1 runs per level open.
+
+
+# Sorted run of items on disk, read back a block at a time
+class _Run:
+    def __init__(self, path):
+        self.path = path
+        self.level = 0  # the amount of merges behind the run
+        self.node = None  # the node of the run in the heap of the runs
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.bytes_read = 0
+        self._items = []
+        self._index = 0
+        self._next_block()
+
+    # Return the smallest item of the run, or None if it is exhausted
+    def head(self):
+        if self._index < len(self._items):
+            return self._items[self._index]
+        return None
+
+    # Remove the head of the run
+    def pop(self):
+        self._index += 1
+        if self._index == len(self._items):
+            self._next_block()
+
+    def _next_block(self):
+        start = self._map.tell()
+        if start == len(self._map):
+            self._items = []
+        else:
+            self._items = pickle.load(self._map)
+            self.bytes_read += self._map.tell() - start
+        self._index = 0
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+        os.remove(self.path)
+
+
+class ExternalHeap:
+    # memory_items is the largest amount of items in memory, block is the
+    # amount of items read or written at once, and directory is where the
+    # run files are written, the temp directory by default. When there are
+    # max_runs runs on one level, they are merged to one.
+    def __init__(
+        self,
+        memory_items=100000,
+        heap_type=HollowHeap,
+        directory=None,
+        block=4096,
+        max_runs=64,
+    ):
+        assert memory_items >= 2, "The frontier needs at least 2 items."
+        assert max_runs >= 2, "Merging needs at least 2 runs."
+        self.memory_items = memory_items
+        self.heap_type = heap_type
+        self.block = block
+        self.max_runs = max_runs
+        self.no_nodes = 0
+        self._frontier = heap_type()
+        self._directory = tempfile.mkdtemp(prefix="heap-", dir=directory)
+        self._runs = heap_type()  # the runs by their head keys
+
+        # I/O counters
+        self.bytes_written = 0
+        self.bytes_spilled = 0  # of the runs spilled from the frontier
+        self.bytes_read = 0  # of the closed runs
+        self.runs_written = 0
+        self.items_spilled = 0
+
+    # Return the minimum item as (key, value), or None if the heap is empty
+    def find_min(self):
+        source = self._min_source()
+        if source is None:
+            return None
+        if source is self._frontier:
+            n = source.find_min()
+            return source.key(n), source.value(n)
+        return source.head()
+
+    # Insert new item to the heap.
+    # Can be called with key (key) or value and key (key, value).
+    # Amortized time complexity: O(log M), M is memory_items
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        self._frontier.insert(key, value)
+        self.no_nodes += 1
+        if self._frontier.no_nodes > self.memory_items:
+            self._spill()
+
+    # Delete the minimum item.
+    # Return it as (key, value), or None if the heap is empty.
+    def delete_min(self):
+        source = self._min_source()
+        if source is None:
+            return None
+        self.no_nodes -= 1
+        if source is self._frontier:
+            n = source.delete_min()
+            return source.key(n), source.value(n)
+
+        return self._pop_run(self._runs)
+
+    # Return the counters of the disk use as a dict
+    def io_stats(self):
+        return {
+            "bytes_written": self.bytes_written,
+            "bytes_read": self.bytes_read
+            + sum(run.bytes_read for _, run in self._runs.items()),
+            "bytes_spilled": self.bytes_spilled,
+            "runs_written": self.runs_written,
+            "runs_open": self._runs.no_nodes,
+            "items_spilled": self.items_spilled,
+        }
+
+    # Delete the run files
+    def close(self):
+        for _, run in self._runs.items():
+            run.close()
+        self._runs = self.heap_type()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Return the frontier or the run which has the min item,
+    # or None if the heap is empty
+    def _min_source(self):
+        frontier = self._frontier
+        runs = self._runs
+        f = frontier.find_min()
+        r = runs.find_min()
+        if r is None:
+            return None if f is None else frontier
+        if f is None or runs.key(r) < frontier.key(f):
+            return runs.value(r)
+        return frontier
+
+    # Delete and return the head of the run with the smallest head
+    # in the heap of runs
+    def _pop_run(self, runs):
+        run = runs.value(runs.delete_min())
+        item = run.head()
+        run.pop()
+        head = run.head()
+        if head is None:
+            self.bytes_read += run.bytes_read
+            run.close()
+        else:
+            run.node = runs.insert(head[0], run)
+        return item
+
+    # Write the larger half of the frontier to a new run
+    def _spill(self):
+        items = sorted(self._frontier.items(), key=itemgetter(0))
+        half = len(items) // 2
+        self._frontier = self.heap_type()
+        self._frontier.insert_many(items[:half], pairs=True)
+        self.items_spilled += len(items) - half
+        block = self.block
+        written = self.bytes_written
+        self._write_run(items[i : i + block] for i in range(half, len(items), block))
+        self.bytes_spilled += self.bytes_written - written
+        self._merge_runs()
+
+    # Write the sorted blocks of items to a new run
+    def _write_run(self, blocks, level=0):
+        path = os.path.join(self._directory, f"run-{self.runs_written}")
+        with open(path, "wb") as f:
+            for block in blocks:
+                pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+            self.bytes_written += f.tell()
+        self.runs_written += 1
+
+        run = _Run(path)
+        run.level = level
+        run.node = self._runs.insert(run.head()[0], run)
+
+    # Merge the runs of every level which has max_runs runs to one run
+    # on the next level, from level 0 up
+    def _merge_runs(self):
+        level = 0
+        while True:
+            runs = [run for _, run in self._runs.items() if run.level == level]
+            if len(runs) < self.max_runs:
+                return
+            self._merge(runs, level + 1)
+            level += 1
+
+    # Merge the runs to one run on the given level
+    def _merge(self, runs, level):
+        group = self.heap_type()
+        for run in runs:
+            self._runs.delete(run.node)
+            run.node = group.insert(run.head()[0], run)
+
+        def blocks():
+            block = []
+            while group.no_nodes:
+                block.append(self._pop_run(group))
+                if len(block) == self.block:
+                    yield block
+                    block = []
+            if block:
+                yield block
+
+        self._write_run(blocks(), level)
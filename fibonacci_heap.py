@@ -1,8 +1,13 @@
 import math
 import abstract_heap as heap
 
+# 1 / log(golden ratio), the degree bound is log(n) * _INV_LOG_PHI
+_INV_LOG_PHI = 1 / math.log((1 + math.sqrt(5)) / 2)
+
 
 class _Node(heap.HeapNode):
+    __slots__ = ("key", "val", "parent", "child", "left", "right", "degree", "flag")
+
     def __init__(self, key, val):
         self.key = key
         self.val = val
@@ -14,10 +19,18 @@ class _Node(heap.HeapNode):
 
 # Implementation of FibonacciHeap.
 # https://en.wikipedia.org/wiki/Fibonacci_heap
+# If pool_size > 0, deleted nodes are kept in a free list and reused by
+# insert. Then a deleted node is valid only until the next insert, and
+# the pool does not keep the values: a node given out by delete_min or
+# pop_until keeps its value until the next insert or delete.
 class FibonacciHeap(heap.Heap):
-    def __init__(self):
+    def __init__(self, pool_size=0):
         self.min = None
         self.no_nodes = 0
+        self.pool_size = pool_size
+        self._pool = []
+        self._returned = []  # pooled nodes given out with their values
+        self._degree_table = []
 
     # Return the minimum node.
     # Amortized time complexity: O(1)
@@ -31,7 +44,7 @@ class FibonacciHeap(heap.Heap):
     def insert(self, key, value=None):
         if value is None:
             value = key
-        n = _Node(key, value)
+        n = self._new_node(key, value)
 
         # totally new heap
         if self.no_nodes == 0:
@@ -47,26 +60,32 @@ class FibonacciHeap(heap.Heap):
     # Delete the given node.
     # Amortized time complexity: O(log n)
     def delete(self, node):
-        assert self.min is not None
-        self.decrease_key(node, self.min.key - 1)
-        self.delete_min()
+        if node is self.min:
+            self.delete_min()
+            return
+        if self._returned:
+            self._drop_returned()
+
+        # cut the node to the root level
+        parent = node.parent
+        if parent is not None:
+            self._cut(node)
+            self._cascading_cut(parent)
+
+        # the min stays, so there is no need to consolidate
+        self._move_children_to_root(node)
+        self._remove_node(node)
+        self.no_nodes -= 1
+        self._release(node)
 
     # Delete and returns the minimum node.
     # Amortized time complexity: O(log n)
     def delete_min(self):
+        if self._returned:
+            self._drop_returned()
         prev_min = self.min
         if prev_min is not None:
-
-            # move children to root
-            if prev_min.child is not None:
-                n = stop = prev_min.child
-                first_loop = True
-                while first_loop or n != stop:
-                    first_loop = False
-                    next_node = n.right
-                    self._add_node_left(n, self.min)
-                    n.parent = None
-                    n = next_node
+            self._move_children_to_root(prev_min)
 
             # remove current min
             if self.min.right != self.min:
@@ -79,42 +98,93 @@ class FibonacciHeap(heap.Heap):
                 self._remove_node(prev_min)
 
             self.no_nodes -= 1
+            self._release(prev_min, True)
         return prev_min
 
     # Make the degrees of root elements unique, fibonacci sequence
     def _consolidate(self):
-        degree_arr = [None for _ in range(int(math.log(self.no_nodes, 2)) + 2)]
-        root_items = self._layer_as_list(self.min)
-        for n in root_items:
+        # degrees are at most log_phi(n), so the table of the previous
+        # consolidation is reused and only grows with the heap
+        table = self._degree_table
+        size = int(math.log(self.no_nodes) * _INV_LOG_PHI) + 2
+        if len(table) < size:
+            table.extend([None] * (size - len(table)))
+
+        # detach the roots one by one and link the same degrees together
+        n = self.min
+        n.left.right = None
+        max_degree = 0
+        while n is not None:
+            next_node = n.right
+            n.left = n.right = n
 
             degree = n.degree
             # combine nodes until no same root degrees exists
-            while degree_arr[degree] is not None:
-                m = degree_arr[degree]
+            while table[degree] is not None:
+                m = table[degree]
                 # make sure that n is always smaller
                 if m.key < n.key:
-                    n, m = self._swap_vars(n, m)
-                self._remove_node(m)
+                    n, m = m, n
                 self._add_child(m, n)
-                degree_arr[degree] = None
+                table[degree] = None
                 degree += 1
+                if degree == len(table):
+                    table.append(None)
 
-            degree_arr[degree] = n
-
-        self._update_root_min()
+            table[degree] = n
+            if degree > max_degree:
+                max_degree = degree
+            n = next_node
 
-    # Update self.min to lowest value from the root
-    def _update_root_min(self):
-        top = self._find_root_item()
-        root_layer = self._layer_as_list(top)
-        self.min = min(root_layer, key=lambda n: n.key)
+        # the roots left in the table form the new root layer,
+        # collect them and clear the table for the next time
+        self.min = None
+        for degree in range(max_degree + 1):
+            n = table[degree]
+            if n is not None:
+                table[degree] = None
+                if self.min is None:
+                    self.min = n
+                else:
+                    self._add_node_left(n, self.min)
+                    if n.key < self.min.key:
+                        self.min = n
+
+    # Delete the given nodes, the parent of every node is given too.
+    # Their other children become roots, and the roots are consolidated
+    # once.
+    # Amortized time complexity: O(m + log n), m is the amount of nodes
+    def _delete_nodes(self, nodes):
+        if self._returned:
+            self._drop_returned()
+        if not nodes:
+            return
+        removed = set(nodes)
+        roots = [r for r in self._siblings(self.min) if r not in removed]
+        for n in nodes:
+            if n.child is not None:
+                roots.extend(c for c in self._siblings(n.child) if c not in removed)
+
+        self.no_nodes -= len(nodes)
+        for n in nodes:
+            n.child = None
+            n.degree = 0
+            self._release(n, True)
+
+        if not roots:
+            self.min = None
+            return
 
-    # Return an item from root layer
-    def _find_root_item(self):
-        top_item = self.min
-        while top_item.parent is not None:
-            top_item = top_item.parent
-        return top_item
+        # make the new root layer and consolidate it
+        prev = roots[-1]
+        for r in roots:
+            r.parent = None
+            r.flag = False
+            prev.right = r
+            r.left = prev
+            prev = r
+        self.min = roots[0]
+        self._consolidate()
 
     # Decrease the value of the key of the given nodes.
     # new_key must lower than current key value.
@@ -139,6 +209,29 @@ class FibonacciHeap(heap.Heap):
 
         return node
 
+    # Change the key of the given node to any new key.
+    # A larger key moves the node and its children to the root level.
+    # Return the updated node.
+    # Amortized time complexity: O(1) if decreased, O(log n) if increased
+    def update_key(self, node, new_key):
+        if new_key == node.key:
+            return node
+        if new_key < node.key:
+            return self.decrease_key(node, new_key)
+
+        parent = node.parent
+        if parent is not None:
+            self._cut(node)
+            self._cascading_cut(parent)
+        node.key = new_key
+
+        self._move_children_to_root(node)
+
+        # the min may be elsewhere now
+        if node is self.min:
+            self._consolidate()
+        return node
+
     # Move the node root level
     def _cut(self, node):
         parent = node.parent
@@ -161,41 +254,156 @@ class FibonacciHeap(heap.Heap):
     # Reorganize the heap to keep it in optimal form
     def _cascading_cut(self, node):
         parent = node.parent
+        while parent is not None and parent.flag:
+            self._cut(node)
+            node = parent
+            parent = node.parent
         if parent is not None:
-            if parent.flag:
-                self._cut(node)
-                self._cascading_cut(parent)
-            else:
-                parent.flag = True
+            parent.flag = True
 
     # Merge another heap into this heap.
     # Amortized time complexity: O(1)
     def merge(self, heap):
         assert isinstance(heap, FibonacciHeap)
+        self._merge_roots(heap.min)
+        self.no_nodes += heap.no_nodes
 
-        # if a heap is empty
-        if heap.min is None:
+    # Insert many items to the heap in one pass.
+    # items are keys, or (key, value) pairs if pairs is True.
+    # Return the nodes in input order.
+    # Time complexity: O(m), m is the amount of the items
+    def insert_many(self, items, pairs=False):
+        if not pairs:
+            items = ((key, None) for key in items)
+
+        nodes = []
+        new_node = self._new_node
+        first = last = new_min = None
+        for key, value in items:
+            n = new_node(key, key if value is None else value)
+            nodes.append(n)
+
+            # chain the new nodes to one layer
+            if first is None:
+                first = new_min = n
+            else:
+                last.right = n
+                n.left = last
+                if key < new_min.key:
+                    new_min = n
+            last = n
+
+        if first is not None:
+            last.right = first
+            first.left = last
+            self._merge_roots(new_min)
+            self.no_nodes += len(nodes)
+        return nodes
+
+    # Merge a root layer into the root layer of this heap.
+    # The node with the lowest key of the layer must be given.
+    def _merge_roots(self, other_min):
+        # if a layer is empty
+        if other_min is None:
             return
         if self.min is None:
-            self.min = heap.min
+            self.min = other_min
             return
 
-        # move given heap between min and min.right
+        # move given layer between min and min.right
         # self.first <-> heap.first <-> ... <-> heap.last   <-> self.last
         # first      <-> second     <-> ... <-> second_last <-> last
         first = self.min
         last = self.min.right
-        second = heap.min
-        second_last = heap.min.left
+        second = other_min
+        second_last = other_min.left
 
         first.right = second
         second.left = first
         last.left = second_last
         second_last.right = last
 
-        self.no_nodes += heap.no_nodes
-        if heap.min.key < self.min.key:
-            self.min = heap.min
+        if other_min.key < self.min.key:
+            self.min = other_min
+
+    # Iterate over the nodes, every tree layer at a time
+    def _nodes(self):
+        if self.min is None:
+            return
+        stack = [self.min]
+        while stack:
+            n = stop = stack.pop()
+            first_loop = True
+            while first_loop or n != stop:
+                first_loop = False
+                yield n
+                if n.child is not None:
+                    stack.append(n.child)
+                n = n.right
+
+    # Iterate over the roots
+    def _roots(self):
+        if self.min is None:
+            return []
+        return self._siblings(self.min)
+
+    # Iterate over the children of the node
+    def _children(self, node):
+        if node.child is None:
+            return []
+        return self._siblings(node.child)
+
+    # Iterate over the circular list of the node
+    def _siblings(self, node):
+        n = node
+        while True:
+            yield n
+            n = n.right
+            if n is node:
+                return
+
+    # Return a new node, reuse a pooled one if possible
+    def _new_node(self, key, value):
+        if self._returned:
+            self._drop_returned()
+        if self._pool:
+            n = self._pool.pop()
+            n.__init__(key, value)
+            return n
+        return _Node(key, value)
+
+    # Give a node that left the heap to the pool, without its value.
+    # A returned node keeps its value until _drop_returned.
+    def _release(self, node, returned=False):
+        if len(self._pool) < self.pool_size:
+            node.child = None
+            if returned:
+                self._returned.append(node)
+            else:
+                node.val = None
+            self._pool.append(node)
+
+    # Drop the values of the pooled nodes given out before
+    def _drop_returned(self):
+        for n in self._returned:
+            n.val = None
+        self._returned.clear()
+
+    # Move the children of the node to the root level
+    def _move_children_to_root(self, node):
+        if node.child is None:
+            return
+        n = stop = node.child
+        first_loop = True
+        while first_loop or n != stop:
+            first_loop = False
+            next_node = n.right
+            self._add_node_left(n, self.min)
+            n.parent = None
+            n.flag = False
+            n = next_node
+        node.child = None
+        node.degree = 0
 
     # Add node to left side of the given right_node
     def _add_node_left(self, node, right_node):
@@ -220,10 +428,6 @@ class FibonacciHeap(heap.Heap):
             child.parent = parent
         parent.degree += 1
 
-    # Swap variables
-    def _swap_vars(self, var1, var2):
-        return (var2, var1)
-
     # Remove element from the double linked list
     def _remove_node(self, node):
         node.left.right = node.right
@@ -231,15 +435,3 @@ class FibonacciHeap(heap.Heap):
         node.left = node
         node.right = node
         node.parent = None
-
-    # Return the whole layer as a list.
-    # One node from the layer must be given
-    def _layer_as_list(self, node):
-        items = []
-        n = stop = node
-        first_loop = True
-        while first_loop or n != stop:
-            first_loop = False
-            items.append(n)
-            n = n.right
-        return items
@@ -2,39 +2,39 @@ import math
 import abstract_heap as heap
 
 
+# The item of the paper is stored in the node itself.
+# A node is hollow when its item has been moved or deleted.
 class _Node(heap.HeapNode):
+    __slots__ = ("key", "val", "child", "right", "ep", "rank", "hollow", "handle")
+
     def __init__(self, key, val):
         self.key = key
-        self.item = _Item(val, self)
+        self.val = val
         self.child = self.right = None
         self.ep = None  # extra parent, only hollow can have it
         self.rank = 0
-
-    @property
-    def val(self):
-        if self.item is not None:
-            return self.item.val
-        else:
-            return None
-
-    @val.setter
-    def val(self, val):
-        if self.item is not None:
-            self.item.val = val
-
-
-class _Item:
-    def __init__(self, val, node):
-        self.val = val
-        self.node = node
+        self.hollow = False
+        self.handle = None  # stable handle of the item, if one is given out
 
 
 # Implementation of Hollow Heap
 # https://arxiv.org/abs/1510.06535
+# If pool_size > 0, nodes dropped from the heap are kept in a free list
+# and reused by insert and decrease_key. Then a deleted node is valid
+# only until the next insert or decrease_key, and the pool does not keep
+# the values: a node given out by delete_min or pop_until keeps its value
+# until the next insert, decrease_key or delete.
+# If rebuild_ratio is given, the heap is rebuilt when there are more than
+# rebuild_ratio hollow nodes per item.
 class HollowHeap(heap.Heap):
-    def __init__(self):
+    def __init__(self, pool_size=0, rebuild_ratio=None):
         self.min = None
-        self.no_nodes = 0
+        self.no_nodes = 0  # amount of items, aka full nodes
+        self.no_hollow = 0  # amount of hollow nodes still in the heap
+        self.pool_size = pool_size
+        self.rebuild_ratio = rebuild_ratio
+        self._pool = []
+        self._returned = []  # pooled nodes given out with their values
 
     # Return the minimum node.
     # Amortized time complexity: O(1)
@@ -49,7 +49,7 @@ class HollowHeap(heap.Heap):
         if value is None:
             value = key
 
-        n = _Node(key, value)
+        n = self._new_node(key, value)
         self.min = self._meld(n, self.min)
         self.no_nodes += 1
         return n
@@ -58,24 +58,70 @@ class HollowHeap(heap.Heap):
     # Amortized time complexity: O(log n)
     def delete_min(self):
         prev_min = self.min
-        self.delete(self.min)
+        if prev_min is None or not self.pool_size:
+            self.delete(prev_min)
+            return prev_min
+
+        # the pool drops the value, give it back until the next change
+        value = prev_min.val
+        self.delete(prev_min)
+        prev_min.val = value
+        self._returned.append(prev_min)
         return prev_min
 
     # Delete the given node.
     # Amortized time complexity: O(log n)
     def delete(self, node):
+        if self._returned:
+            self._drop_returned()
         if node is None:
             return
 
-        node.item = None
+        node.hollow = True
         node = None
+        self.no_hollow += 1
+        self.no_nodes -= 1
 
         # lazy deletion
-        if self.min.item is not None:
-            self.no_nodes -= 1
+        if not self.min.hollow:
+            self._check_rebuild()
             return self.min
 
+        self._remove_hollow_top()
+
+    # Delete the given nodes, the parent of every node is given too.
+    # They are made hollow, and the hollow nodes at the top are removed
+    # in one pass.
+    # Amortized time complexity: O(m + log n), m is the amount of nodes
+    def _delete_nodes(self, nodes):
+        if self._returned:
+            self._drop_returned()
+        if not nodes:
+            return
+        for n in nodes:
+            n.hollow = True
+        self.no_hollow += len(nodes)
+        self.no_nodes -= len(nodes)
+        if not self.min.hollow:
+            self._check_rebuild()
+            return
+
+        values = [n.val for n in nodes]
+        self._remove_hollow_top()
+        if self.pool_size:
+            # the pool drops the values, give them back until the next
+            # change
+            for n, value in zip(nodes, values):
+                n.val = value
+            self._returned.extend(nodes)
+
+    # Remove the hollow min and the hollow nodes reachable through hollow
+    # nodes, and link the full nodes below them to a new tree.
+    # Return the amount of the visited hollow nodes, the removed ones and
+    # the ones with two parents which lose one.
+    def _remove_hollow_top(self):
         A = {}
+        visited = 0
         h = self.min  # use same naming as in pseudo code
         h.right = None
         while h is not None:
@@ -89,7 +135,7 @@ class HollowHeap(heap.Heap):
                 w = w.right
 
                 # if hollow
-                if u.item is None:
+                if u.hollow:
                     if u.ep is None:
                         u.right = h
                         h = u
@@ -99,6 +145,7 @@ class HollowHeap(heap.Heap):
                         else:
                             u.right = None
                         u.ep = None
+                        visited += 1
                 else:
                     # do ranked links
                     # similiar to fibonacci heap, unique ranks
@@ -108,6 +155,11 @@ class HollowHeap(heap.Heap):
                         u.rank += 1
                     A[u.rank] = u
 
+            # v is hollow and not reachable anymore
+            self.no_hollow -= 1
+            visited += 1
+            self._release(v)
+
         # do unranked links
         # combine subtrees with unique rank and finds the root, aka min
         for i in A:
@@ -116,11 +168,11 @@ class HollowHeap(heap.Heap):
             else:
                 h = self._link(h, A[i])  # returns the smaller one
 
-        self.no_nodes -= 1
         # update the min
         self.min = h
         if self.min is not None:
             self.min.right = None
+        return visited
 
     # Decrease the value of the key of the given nodes.
     # new_key must lower than current key value.
@@ -131,7 +183,7 @@ class HollowHeap(heap.Heap):
             node.key > new_key
         ), "The new_key must be lower than current when decreasing key."
         assert (
-            node.item is not None
+            not node.hollow
         ), "The node is missing item. It's hollow. Cannot be decreased."
 
         u = node  # same naming as in pseudo code
@@ -142,8 +194,11 @@ class HollowHeap(heap.Heap):
             return self.min
 
         # otherwise
-        v = _Node(new_key, u.item.val)
-        u.item = None
+        v = self._new_node(new_key, u.val)
+        u.hollow = True
+        u.val = None
+        if u.handle is not None:
+            self._move_handle(u, v)
 
         if u.rank > 2:
             v.rank = u.rank - 2
@@ -153,6 +208,28 @@ class HollowHeap(heap.Heap):
         h = self._link(v, self.min)
         if h != self.min:
             self.min = h
+        self.no_hollow += 1
+        self._check_rebuild()
+        return v
+
+    # Change the key of the given node to any new key.
+    # A larger key moves the item to a new node, and the old node is
+    # deleted lazily.
+    # Return the updated node.
+    # Amortized time complexity: O(1), O(log n) if the min is increased
+    def update_key(self, node, new_key):
+        if new_key == node.key:
+            return node
+        if new_key < node.key:
+            return self.decrease_key(node, new_key)
+
+        v = self._new_node(new_key, node.val)
+        if node.handle is not None:
+            self._move_handle(node, v)
+        node.val = None
+        self.delete(node)
+        self.min = self._meld(v, self.min)
+        self.no_nodes += 1
         return v
 
     # Merge another heap into this heap
@@ -161,6 +238,162 @@ class HollowHeap(heap.Heap):
         assert isinstance(heap, HollowHeap)
         self.min = self._meld(self.min, heap.min)
         self.no_nodes += heap.no_nodes
+        self.no_hollow += heap.no_hollow
+
+    # Insert many items to the heap in one pass.
+    # items are keys, or (key, value) pairs if pairs is True.
+    # Return the nodes in input order.
+    # Time complexity: O(m), m is the amount of the items
+    def insert_many(self, items, pairs=False):
+        if not pairs:
+            items = ((key, None) for key in items)
+
+        nodes = []
+        new_node = self._new_node
+        new_min = chain = None
+        for key, value in items:
+            n = new_node(key, key if value is None else value)
+            nodes.append(n)
+
+            # chain all but the smallest node, they become its children
+            if new_min is None:
+                new_min = n
+                continue
+            if key < new_min.key:
+                n, new_min = new_min, n
+            n.right = chain
+            chain = n
+
+        if new_min is not None:
+            new_min.child = chain
+            self.min = self._meld(new_min, self.min)
+            self.no_nodes += len(nodes)
+        return nodes
+
+    # Return a stable handle of the item of the given node.
+    # The handle follows the item to the new node in decrease_key.
+    def handle(self, node):
+        assert not node.hollow, "The node is hollow. It has no item."
+        if node.handle is None:
+            node.handle = heap.Handle(node)
+        return node.handle
+
+    # Move the handle of the item from the node u to the node v
+    def _move_handle(self, u, v):
+        v.handle = u.handle
+        v.handle.node = v
+        u.handle = None
+
+    # Rebuild the heap from its items and drop all hollow nodes.
+    # The full nodes are kept, so the nodes given out stay valid.
+    # Time complexity: O(N), N is the amount of all nodes
+    def rebuild(self):
+        if self.min is None:
+            return
+
+        # make the smallest item the parent of the others
+        new_min = None
+        for n in self._all_nodes():
+            if n.hollow:
+                self._release(n)
+                continue
+            n.child = n.right = n.ep = None
+            n.rank = 0
+            if new_min is None:
+                new_min = n
+            elif n.key < new_min.key:
+                self._add_child(new_min, n)
+                new_min = n
+            else:
+                self._add_child(n, new_min)
+
+        self.min = new_min
+        self.no_hollow = 0
+
+    # Iterate over the nodes from the smallest key up, without changing
+    # the heap. The hollow nodes are walked through but not given out.
+    # Time complexity: see Heap.iter_sorted, the hollow nodes count too
+    def iter_sorted(self):
+        for n in super().iter_sorted():
+            if not n.hollow:
+                yield n
+
+    # Iterate over the full nodes in the range of Heap._nodes_until
+    def _nodes_until(self, threshold, strict=False):
+        for n in super()._nodes_until(threshold, strict):
+            if not n.hollow:
+                yield n
+
+    # Iterate over the root
+    def _roots(self):
+        return [self.min] if self.min is not None else []
+
+    # Iterate over the children of the node.
+    # A node with an extra parent is the last child of the extra parent,
+    # and it is given out only there, so it is visited only once.
+    def _children(self, node):
+        w = node.child
+        while w is not None:
+            if w.ep is node:
+                yield w
+                return
+            if w.ep is None:
+                yield w
+            w = w.right
+
+    # Iterate over the full nodes
+    def _nodes(self):
+        return (n for n in self._all_nodes() if not n.hollow)
+
+    # Return all nodes of the DAG, also the hollow ones
+    def _all_nodes(self):
+        if self.min is None:
+            return []
+
+        # a node with an extra parent is the last child of the extra parent
+        nodes = [self.min]
+        seen = {self.min}
+        for v in nodes:
+            w = v.child
+            while w is not None:
+                if w not in seen:
+                    seen.add(w)
+                    nodes.append(w)
+                if w.ep is v:
+                    break
+                w = w.right
+        return nodes
+
+    # Rebuild the heap if it has too many hollow nodes
+    def _check_rebuild(self):
+        if (
+            self.rebuild_ratio is not None
+            and self.no_hollow > self.rebuild_ratio * self.no_nodes
+        ):
+            self.rebuild()
+
+    # Return a new node, reuse a pooled one if possible
+    def _new_node(self, key, value):
+        if self._returned:
+            self._drop_returned()
+        if self._pool:
+            n = self._pool.pop()
+            n.__init__(key, value)
+            return n
+        return _Node(key, value)
+
+    # Give a node that left the heap to the pool, without its value
+    def _release(self, node):
+        if len(self._pool) < self.pool_size:
+            node.child = node.right = node.ep = None
+            node.val = node.handle = None
+            self._pool.append(node)
+
+    # Drop the values of the nodes given out before
+    def _drop_returned(self):
+        for n in self._returned:
+            n.val = None
+        self._returned.clear()
 
     # Combine two sub trees
     def _meld(self, n, m):
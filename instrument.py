@@ -0,0 +1,247 @@
+import time
+from fibonacci_heap import FibonacciHeap
+from hollow_heap import HollowHeap
+from array_fibonacci_heap import ArrayFibonacciHeap
+from pairing_heap import PairingHeap
+
+# Opt-in instrumentation of the heap internals.
+#
+# instrument(heap) changes the class of the heap to an instrumented
+# subclass and returns the HeapStats of the heap. The heap classes
+# themselves are not changed, so a heap which is not instrumented runs
+# without any extra cost.
+#
+#   heap = FibonacciHeap()
+#   stats = instrument(heap, latency=True)
+#   ...
+#   stats.snapshot()  # -> {"links": 12, "cuts": 3, ...}
+
+# public operations which get a latency histogram
+_TIMED_METHODS = (
+    "find_min",
+    "insert",
+    "insert_many",
+    "delete",
+    "delete_min",
+    "decrease_key",
+    "update_key",
+    "merge",
+    "k_smallest",
+    "pop_until",
+    "pop_many",
+    "count_below",
+    "rebuild",
+)
+
+
+# Histogram of non-negative integers with power of two buckets.
+# The bucket b counts the values v where 2^(b-1) <= v < 2^b.
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = {}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        b = value.bit_length()
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    # Return the histogram as a dict, buckets by their upper bound
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {1 << b: c for b, c in sorted(self.buckets.items())},
+        }
+
+
+# Counters of the heap internals
+class HeapStats:
+    def __init__(self):
+        self.links = 0
+        self.cuts = 0
+        self.cascading_cuts = 0  # cuts done by _cascading_cut
+        self.max_degree = 0  # largest degree after a link, Fibonacci heaps
+        self.max_rank = 0  # largest rank of a linked node, hollow heap
+        self.consolidate_roots = Histogram()  # roots at each _consolidate
+        # hollow nodes visited per delete or batch of deletes
+        self.hollow_traversed = Histogram()
+        self.latency = {}  # operation -> Histogram of nanoseconds
+
+    # Return all counters as a dict
+    def snapshot(self):
+        return {
+            "links": self.links,
+            "cuts": self.cuts,
+            "cascading_cuts": self.cascading_cuts,
+            "max_degree": self.max_degree,
+            "max_rank": self.max_rank,
+            "consolidate_roots": self.consolidate_roots.snapshot(),
+            "hollow_traversed": self.hollow_traversed.snapshot(),
+            "latency": {op: h.snapshot() for op, h in sorted(self.latency.items())},
+        }
+
+
+# Counters shared by the both Fibonacci heaps
+class _FibonacciCounters:
+    def _add_child(self, child, parent):
+        super()._add_child(child, parent)
+        stats = self._stats
+        stats.links += 1
+        degree = self._degree_of(parent)
+        if degree > stats.max_degree:
+            stats.max_degree = degree
+
+    def _cut(self, node):
+        super()._cut(node)
+        self._stats.cuts += 1
+
+    def _cascading_cut(self, node):
+        stats = self._stats
+        cuts = stats.cuts
+        super()._cascading_cut(node)
+        stats.cascading_cuts += stats.cuts - cuts
+
+    def _consolidate(self):
+        self._stats.consolidate_roots.add(self._count_roots())
+        super()._consolidate()
+
+
+class _InstrumentedFibonacciHeap(_FibonacciCounters, FibonacciHeap):
+    def _degree_of(self, node):
+        return node.degree
+
+    def _count_roots(self):
+        count = 1
+        n = self.min.right
+        while n is not self.min:
+            count += 1
+            n = n.right
+        return count
+
+
+class _InstrumentedArrayFibonacciHeap(_FibonacciCounters, ArrayFibonacciHeap):
+    def _degree_of(self, node):
+        return self._degree[node]
+
+    def _count_roots(self):
+        count = 1
+        n = self._right[self.min]
+        while n != self.min:
+            count += 1
+            n = self._right[n]
+        return count
+
+
+class _InstrumentedHollowHeap(HollowHeap):
+    def _link(self, n, m):
+        stats = self._stats
+        stats.links += 1
+        rank = n.rank if n.rank > m.rank else m.rank
+        if rank > stats.max_rank:
+            stats.max_rank = rank
+        return super()._link(n, m)
+
+    # a lazy delete visits no hollow nodes
+    def delete(self, node):
+        if node is None:
+            return super().delete(node)
+        self._traversed = 0
+        result = super().delete(node)
+        self._stats.hollow_traversed.add(self._traversed)
+        return result
+
+    def _delete_nodes(self, nodes):
+        self._traversed = 0
+        super()._delete_nodes(nodes)
+        self._stats.hollow_traversed.add(self._traversed)
+
+    def _remove_hollow_top(self):
+        visited = super()._remove_hollow_top()
+        self._traversed += visited
+        return visited
+
+
+class _InstrumentedPairingHeap(PairingHeap):
+    def _link(self, n, m):
+        self._stats.links += 1
+        return super()._link(n, m)
+
+
+# engine -> subclass with counters
+_COUNTERS = {
+    FibonacciHeap: _InstrumentedFibonacciHeap,
+    ArrayFibonacciHeap: _InstrumentedArrayFibonacciHeap,
+    HollowHeap: _InstrumentedHollowHeap,
+    PairingHeap: _InstrumentedPairingHeap,
+}
+
+# (engine, latency) -> instrumented class
+_classes = {}
+
+
+# Return a method which adds its running time to a latency histogram.
+# Only the outermost public call is recorded, so e.g. the delete inside
+# update_key is not counted again.
+def _timed(name, method):
+    def timed(self, *args, **kwargs):
+        if self._timing:
+            return method(self, *args, **kwargs)
+        self._timing = True
+        start = time.perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._timing = False
+            latency = self._stats.latency
+            if name not in latency:
+                latency[name] = Histogram()
+            latency[name].add(time.perf_counter_ns() - start)
+
+    timed.__name__ = name
+    return timed
+
+
+# Return the instrumented class of the given engine
+def _instrumented_class(heap_type, latency):
+    key = (heap_type, latency)
+    if key not in _classes:
+        cls = _COUNTERS.get(heap_type, heap_type)
+        if latency:
+            methods = {
+                name: _timed(name, getattr(cls, name))
+                for name in _TIMED_METHODS
+                if hasattr(cls, name)
+            }
+            methods["_timing"] = False  # inside a timed call
+            cls = type(f"Timed{heap_type.__name__}", (cls,), methods)
+        elif cls is heap_type:
+            cls = type(f"Instrumented{heap_type.__name__}", (cls,), {})
+        cls._uninstrumented = heap_type
+        _classes[key] = cls
+    return _classes[key]
+
+
+# Start collecting counters of the given heap, and per operation
+# latency histograms if latency is True. Return the HeapStats.
+# Engines without internal counters only get the latencies.
+def instrument(heap, latency=False):
+    heap_type = getattr(type(heap), "_uninstrumented", type(heap))
+    heap.__class__ = _instrumented_class(heap_type, latency)
+    heap._stats = HeapStats()
+    return heap._stats
+
+
+# Stop collecting, the heap runs the original code again.
+# Return the collected HeapStats.
+def uninstrument(heap):
+    heap.__class__ = getattr(type(heap), "_uninstrumented", type(heap))
+    heap.__dict__.pop("_timing", None)
+    heap.__dict__.pop("_traversed", None)
+    return heap.__dict__.pop("_stats", None)
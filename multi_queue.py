@@ -0,0 +1,147 @@
+import os
+import random
+import threading
+from hollow_heap import HollowHeap
+
+# Thread-safe relaxed priority queue, a MultiQueue.
+#
+# The items are spread over many heaps, shards, and every shard has its
+# own lock, so threads working on different shards do not wait for each
+# other. insert puts the item into a random shard. delete_min looks at the
+# minimums of two random shards and takes the smaller one, so the deleted
+# item is one of the smallest but not always the smallest. With
+# strict=True delete_min locks every shard and takes the real minimum.
+#
+#   queue = MultiQueue(shards=8)
+#   queue.insert(3, "C")    # from any thread
+#   queue.delete_min()      # -> (key, value), or None if empty
+#
+# https://arxiv.org/abs/1411.1209
+
+_EMPTY = object()  # the minimum key of an empty shard
+
+
+class MultiQueue:
+    # shards is the amount of the internal heaps, by default two per CPU.
+    # heap_type is the engine of the shards.
+    def __init__(self, shards=None, heap_type=HollowHeap, strict=False, seed=None):
+        if shards is None:
+            shards = 2 * (os.cpu_count() or 1)
+        assert shards >= 1, "The queue needs at least one shard."
+        self.strict = strict
+        self._heaps = [heap_type() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        # minimum key of every shard, read without the lock
+        self._tops = [_EMPTY] * shards
+
+        # every thread gets its own random generator
+        self._seeds = random.Random(seed)
+        self._seeds_lock = threading.Lock()
+        self._local = threading.local()
+
+    # Amount of the items in the queue.
+    # Only exact when no other thread changes the queue.
+    @property
+    def no_nodes(self):
+        return sum(heap.no_nodes for heap in self._heaps)
+
+    # Insert new item to a random shard.
+    # Can be called with key (key) or value and key (key, value).
+    # Time complexity: the insert of the engine
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        rand = self._rng().random
+        shards = len(self._heaps)
+
+        # prefer a shard which is free right now
+        for _ in range(shards):
+            i = int(rand() * shards)
+            lock = self._locks[i]
+            if lock.acquire(blocking=False):
+                break
+        else:
+            lock.acquire()
+
+        try:
+            heap = self._heaps[i]
+            heap.insert(key, value)
+            top = self._tops[i]
+            if top is _EMPTY or key < top:
+                self._tops[i] = key
+        finally:
+            lock.release()
+
+    # Delete an item with a small key, the smallest one in strict mode.
+    # Return the item as (key, value), or None if the queue is empty.
+    # Time complexity: the delete_min of the engine, O(shards) in strict mode
+    def delete_min(self):
+        if self.strict:
+            return self._delete_min_strict()
+
+        rand = self._rng().random
+        shards = len(self._heaps)
+        tops = self._tops
+        for _ in range(2 * shards):
+            # the better of two random shards
+            i = int(rand() * shards)
+            j = int(rand() * shards)
+            top = tops[i]
+            other = tops[j]
+            if top is _EMPTY or (other is not _EMPTY and other < top):
+                i, top = j, other
+            if top is _EMPTY:
+                continue
+
+            lock = self._locks[i]
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                item = self._take(i)
+            finally:
+                lock.release()
+            if item is not None:
+                return item
+
+        # the queue looks empty or busy, check every shard
+        return self._delete_min_strict()
+
+    # Delete the smallest item of all shards
+    def _delete_min_strict(self):
+        locks = self._locks
+        for lock in locks:
+            lock.acquire()
+        try:
+            best = best_key = None
+            for i, heap in enumerate(self._heaps):
+                n = heap.find_min()
+                if n is None:
+                    continue
+                if best is None or heap.key(n) < best_key:
+                    best, best_key = i, heap.key(n)
+            return None if best is None else self._take(best)
+        finally:
+            for lock in locks:
+                lock.release()
+
+    # Delete the min of the shard and update its top.
+    # The lock of the shard must be held.
+    def _take(self, i):
+        heap = self._heaps[i]
+        n = heap.delete_min()
+        if n is None:
+            self._tops[i] = _EMPTY
+            return None
+        item = (heap.key(n), heap.value(n))
+        m = heap.find_min()
+        self._tops[i] = _EMPTY if m is None else heap.key(m)
+        return item
+
+    # Return the random generator of the current thread
+    def _rng(self):
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            with self._seeds_lock:
+                rng = random.Random(self._seeds.getrandbits(64))
+            self._local.rng = rng
+        return rng
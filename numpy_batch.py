@@ -0,0 +1,104 @@
+import numpy as np
+
+# Batch operations of the heaps with NumPy arrays.
+#
+# The heap modules do not need NumPy, only this module imports it.
+# The items of a batch are identified by integer ids: handles[i] is the
+# handle of the item i in the heap, None (or -1 for ArrayFibonacciHeap)
+# if it is not in the heap, and keys[i] is its current key. Set the
+# handle of a deleted item back to None, or it is decreased later.
+#
+#   handles = insert_array(heap, keys, values=np.arange(len(keys)))
+#   decrease_keys(heap, handles, keys, ids, new_keys)
+#   count = pop_k(heap, out_keys, out_values)
+
+
+# Return the handles as an array, int64 if the handles are integers
+def _handle_array(nodes):
+    if nodes and isinstance(nodes[0], int):
+        return np.array(nodes, dtype=np.int64)
+    handles = np.empty(len(nodes), dtype=object)
+    handles[:] = nodes
+    return handles
+
+
+# Return the mask of the handles which are not in the heap
+def _missing(handles):
+    if handles.dtype == object:
+        return np.equal(handles, None)
+    return handles < 0
+
+
+# Insert the items of the arrays to the heap.
+# Without values the value of an item is its key.
+# Return the handles of the items as an array.
+# Time complexity: the insert_many of the engine
+def insert_array(heap, keys, values=None):
+    keys = np.asarray(keys).tolist()
+    if values is None:
+        nodes = heap.insert_many(keys)
+    else:
+        nodes = heap.insert_many(zip(keys, np.asarray(values).tolist()), pairs=True)
+    return _handle_array(nodes)
+
+
+# Decrease the keys of the items ids to new_keys, and insert the items
+# which are not in the heap with their id as the value.
+# The updates which do not lower keys[id] are dropped in NumPy, and for
+# an id given many times only the lowest key is used. handles and keys
+# are updated in place.
+# Return the ids of the updated items.
+# Time complexity: O(m log m) in NumPy, and one decrease_key or insert
+# per updated item
+def decrease_keys(heap, handles, keys, ids, new_keys):
+    ids = np.asarray(ids)
+    new_keys = np.asarray(new_keys)
+
+    # the lowest key of every id
+    order = np.lexsort((new_keys, ids))
+    ids = ids[order]
+    new_keys = new_keys[order]
+    first = np.ones(len(ids), dtype=bool)
+    first[1:] = ids[1:] != ids[:-1]
+    ids = ids[first]
+    new_keys = new_keys[first]
+
+    # drop the updates which do not improve
+    improving = new_keys < keys[ids]
+    ids = ids[improving]
+    new_keys = new_keys[improving]
+    if len(ids) == 0:
+        return ids
+
+    nodes = handles[ids]
+    missing = _missing(nodes)
+    decrease_key = heap.decrease_key
+    insert = heap.insert
+    updated = [
+        insert(k, i) if m else decrease_key(n, k)
+        for n, k, i, m in zip(
+            nodes.tolist(), new_keys.tolist(), ids.tolist(), missing.tolist()
+        )
+    ]
+    handles[ids] = _handle_array(updated)
+    keys[ids] = new_keys
+    return ids
+
+
+# Delete the smallest items and write their keys and values to the
+# given arrays, at most the length of out_keys.
+# Return the amount of the deleted items.
+# Time complexity: one delete_min per item
+def pop_k(heap, out_keys, out_values):
+    key, value = heap.key, heap.value
+    delete_min = heap.delete_min
+    count = min(len(out_keys), heap.no_nodes)
+    popped_keys = [None] * count
+    popped_values = [None] * count
+    for i in range(count):
+        n = delete_min()
+        popped_keys[i] = key(n)
+        popped_values[i] = value(n)
+    out_keys[:count] = popped_keys
+    out_values[:count] = popped_values
+    return count
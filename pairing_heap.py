@@ -0,0 +1,192 @@
+import abstract_heap as heap
+
+
+class _Node(heap.HeapNode):
+    __slots__ = ("key", "val", "child", "left", "right")
+
+    def __init__(self, key, val):
+        self.key = key
+        self.val = val
+        self.child = None
+        self.left = None  # previous sibling, or parent if first child
+        self.right = None  # next sibling
+
+
+# Implementation of Pairing Heap.
+# The heap is a single tree where the children of a node are kept
+# in a double linked list.
+# https://en.wikipedia.org/wiki/Pairing_heap
+class PairingHeap(heap.Heap):
+    def __init__(self):
+        self.min = None
+        self.no_nodes = 0
+
+    # Return the minimum node.
+    # Time complexity: O(1)
+    def find_min(self):
+        return self.min
+
+    # Insert new item as a node to the heap.
+    # Can be called with key (key) or value and key (key, value).
+    # Return the node.
+    # Time complexity: O(1)
+    def insert(self, key, value=None):
+        if value is None:
+            value = key
+        n = _Node(key, value)
+        self.min = self._meld(self.min, n)
+        self.no_nodes += 1
+        return n
+
+    # Delete the given node.
+    # Amortized time complexity: O(log n)
+    def delete(self, node):
+        if node is self.min:
+            self.delete_min()
+            return
+
+        self._cut(node)
+        subtree = self._combine(node.child)
+        node.child = None
+        self.min = self._meld(self.min, subtree)
+        self.no_nodes -= 1
+
+    # Delete and returns the minimum node.
+    # Amortized time complexity: O(log n)
+    def delete_min(self):
+        prev_min = self.min
+        if prev_min is not None:
+            self.min = self._combine(prev_min.child)
+            prev_min.child = None
+            self.no_nodes -= 1
+        return prev_min
+
+    # Decrease the value of the key of the given nodes.
+    # new_key must lower than current key value.
+    # Return the updated node.
+    # Amortized time complexity: O(log n), o(log n) is conjectured
+    def decrease_key(self, node, new_key):
+        assert (
+            node.key > new_key
+        ), "The new_key must be lower than current when decreasing key."
+
+        node.key = new_key
+        # the min is the root, simple case
+        if node is not self.min:
+            self._cut(node)
+            self.min = self._link(self.min, node)
+        return node
+
+    # Change the key of the given node to any new key.
+    # A larger key detaches the children of the node, and the node is
+    # linked back as a single node tree.
+    # Return the updated node.
+    # Amortized time complexity: O(log n)
+    def update_key(self, node, new_key):
+        if new_key == node.key:
+            return node
+        if new_key < node.key:
+            return self.decrease_key(node, new_key)
+
+        if node is self.min:
+            self.min = None
+        else:
+            self._cut(node)
+        subtree = self._combine(node.child)
+        node.child = None
+        node.key = new_key
+        self.min = self._meld(self._meld(self.min, subtree), node)
+        return node
+
+    # Merge another heap into this heap.
+    # Time complexity: O(1)
+    def merge(self, heap):
+        assert isinstance(heap, PairingHeap)
+        self.min = self._meld(self.min, heap.min)
+        self.no_nodes += heap.no_nodes
+
+    # Iterate over the nodes, every sibling list at a time
+    def _nodes(self):
+        stack = [self.min] if self.min is not None else []
+        while stack:
+            n = stack.pop()
+            while n is not None:
+                yield n
+                if n.child is not None:
+                    stack.append(n.child)
+                n = n.right
+
+    # Iterate over the root
+    def _roots(self):
+        return [self.min] if self.min is not None else []
+
+    # Iterate over the children of the node
+    def _children(self, node):
+        n = node.child
+        while n is not None:
+            yield n
+            n = n.right
+
+    # Combine two trees
+    def _meld(self, n, m):
+        if n is None:
+            return m
+        if m is None:
+            return n
+        return self._link(n, m)
+
+    # Make the root with the larger key the first child of the other root.
+    # Return the new root.
+    def _link(self, n, m):
+        if m.key < n.key:
+            n, m = m, n
+        c = n.child
+        m.right = c
+        if c is not None:
+            c.left = m
+        m.left = n
+        n.child = m
+        return n
+
+    # Detach the subtree of the node from its parent
+    def _cut(self, node):
+        if node.left.child is node:
+            node.left.child = node.right
+        else:
+            node.left.right = node.right
+        if node.right is not None:
+            node.right.left = node.left
+        node.left = node.right = None
+
+    # Combine the given list of siblings into one tree with two passes.
+    # Return the root of the tree.
+    def _combine(self, first):
+        if first is None:
+            return None
+
+        # first pass, link pairs from left to right
+        # and chain the results in reverse order
+        n = first
+        chain = None
+        while n is not None:
+            a = n
+            b = a.right
+            n = b.right if b is not None else None
+            a.left = a.right = None
+            if b is not None:
+                b.left = b.right = None
+                a = self._link(a, b)
+            a.right = chain
+            chain = a
+
+        # second pass, link the results from right to left
+        root = chain
+        n = root.right
+        root.right = None
+        while n is not None:
+            next_node = n.right
+            n.right = None
+            root = self._link(root, n)
+            n = next_node
+        root.left = None
+        return root
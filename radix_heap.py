@@ -0,0 +1,173 @@
+import abstract_heap as heap
+
+
+class _Node(heap.HeapNode):
+    __slots__ = ("key", "val", "bucket", "index")
+
+    def __init__(self, key, val):
+        self.key = key
+        self.val = val
+        self.bucket = self.index = 0  # position in the buckets
+
+
+# Implementation of Radix Heap for monotone integer keys.
+# The keys are non-negative integers, and a key cannot be lower than the
+# last deleted minimum. A key is kept in the bucket given by the highest
+# bit where it differs from the last deleted minimum.
+# https://en.wikipedia.org/wiki/Radix_heap
+class RadixHeap(heap.Heap):
+    def __init__(self):
+        self.last = 0  # the last deleted minimum
+        self.buckets = [[]]
+        self.no_nodes = 0
+
+    # Return the minimum node.
+    # Time complexity: O(1) if the min has been deleted before, otherwise
+    # the size of the first non-empty bucket
+    def find_min(self):
+        if self.no_nodes == 0:
+            return None
+        if self.buckets[0]:
+            return self.buckets[0][-1]
+        return min(self._first_bucket(), key=lambda n: n.key)
+
+    # Insert new item as a node to the heap.
+    # Can be called with key (key) or value and key (key, value).
+    # Return the node.
+    # Time complexity: O(1)
+    def insert(self, key, value=None):
+        self._check_key(key)
+        if value is None:
+            value = key
+        n = _Node(key, value)
+        self._put(n)
+        self.no_nodes += 1
+        return n
+
+    # Delete the given node.
+    # Time complexity: O(1)
+    def delete(self, node):
+        self._take(node)
+        self.no_nodes -= 1
+
+    # Delete and returns the minimum node.
+    # Amortized time complexity: O(log C), C is the largest key
+    def delete_min(self):
+        if self.no_nodes == 0:
+            return None
+
+        # move the nodes of the first non-empty bucket to lower buckets
+        if not self.buckets[0]:
+            bucket = self._first_bucket()
+            self.buckets[bucket[0].bucket] = []
+            self.last = min(n.key for n in bucket)
+            for n in bucket:
+                self._put(n)
+
+        prev_min = self.buckets[0].pop()
+        self.no_nodes -= 1
+        return prev_min
+
+    # Decrease the value of the key of the given nodes.
+    # new_key must lower than current key value, and not lower than the
+    # last deleted minimum.
+    # Return the updated node.
+    # Time complexity: O(1)
+    def decrease_key(self, node, new_key):
+        assert (
+            node.key > new_key
+        ), "The new_key must be lower than current when decreasing key."
+        self._check_key(new_key)
+        self._take(node)
+        node.key = new_key
+        self._put(node)
+        return node
+
+    # Change the key of the given node to any new key which is not lower
+    # than the last deleted minimum.
+    # Return the updated node.
+    # Time complexity: O(1)
+    def update_key(self, node, new_key):
+        self._check_key(new_key)
+        self._take(node)
+        node.key = new_key
+        self._put(node)
+        return node
+
+    # Merge another heap into this heap.
+    # The nodes of the given heap are moved to this heap.
+    # Time complexity: O(m), m is the size of the given heap
+    def merge(self, heap):
+        assert isinstance(heap, RadixHeap)
+        nodes = [n for bucket in heap.buckets for n in bucket]
+        for n in nodes:
+            self._check_key(n.key)
+        for n in nodes:
+            self._put(n)
+        self.no_nodes += len(nodes)
+        heap.buckets = [[]]
+        heap.no_nodes = 0
+
+    # Iterate over the nodes bucket by bucket
+    def _nodes(self):
+        return (n for bucket in self.buckets for n in bucket)
+
+    # Iterate over the nodes from the smallest key up, without changing
+    # the heap. The heap must not be changed during the iteration.
+    # The keys of a bucket are smaller than the keys of the next bucket,
+    # so the buckets are sorted one at a time.
+    # Time complexity: O(b log b) per bucket, b is the size of the bucket
+    def iter_sorted(self):
+        for bucket in self.buckets:
+            yield from sorted(bucket, key=lambda n: n.key)
+
+    # Iterate over the nodes whose key is not larger than threshold, or
+    # with strict smaller than threshold. The buckets after a bucket with
+    # a key out of the range are not looked at.
+    def _nodes_until(self, threshold, strict=False):
+        for bucket in self.buckets:
+            larger = False
+            for n in bucket:
+                if not n.key < threshold if strict else threshold < n.key:
+                    larger = True
+                else:
+                    yield n
+            if larger:
+                return
+
+    # Raise TypeError if the key is not an integer, and ValueError if it
+    # breaks the monotone order
+    def _check_key(self, key):
+        if isinstance(key, bool) or not isinstance(key, int):
+            raise TypeError(
+                f"The key {key!r} is not an integer, the radix heap needs "
+                "non-negative integer keys."
+            )
+        if key < self.last:
+            raise ValueError(
+                f"The key {key} is lower than the last deleted minimum {self.last}."
+            )
+
+    # Return the first non-empty bucket
+    def _first_bucket(self):
+        for bucket in self.buckets:
+            if bucket:
+                return bucket
+
+    # Add the node to its bucket
+    def _put(self, node):
+        b = (node.key ^ self.last).bit_length()
+        while b >= len(self.buckets):
+            self.buckets.append([])
+        bucket = self.buckets[b]
+        node.bucket = b
+        node.index = len(bucket)
+        bucket.append(node)
+
+    # Remove the node from its bucket
+    def _take(self, node):
+        bucket = self.buckets[node.bucket]
+        last = bucket.pop()
+        if last is not node:
+            bucket[node.index] = last
+            last.index = node.index
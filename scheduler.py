@@ -0,0 +1,122 @@
+import time
+from hollow_heap import HollowHeap
+
+# Timers on top of a heap engine.
+#
+# A timer is a node of the heap keyed by its time. HollowHeap deletes a
+# node which is not the min lazily in O(1) time, and decreases a key in
+# O(1) time, so timers which are cancelled or moved earlier are cheap.
+#
+#   clock = VirtualClock()
+#   scheduler = Scheduler(clock)
+#   timer = scheduler.schedule(5, print, "five")
+#   scheduler.reschedule(timer, 3)
+#   clock.advance(3)
+#   scheduler.run_due()  # prints "five"
+
+# states of a timer
+PENDING = 0  # waiting in the heap
+DUE = 1  # taken from the heap by run_due, not fired yet
+DONE = 2  # fired or cancelled
+
+
+# Clock for tests and simulations, the time only moves when told
+class VirtualClock:
+    def __init__(self, now=0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    # Move the time forward by dt
+    def advance(self, dt):
+        self.now += dt
+
+
+class Timer:
+    __slots__ = ("at", "callback", "args", "node", "state")
+
+    def __init__(self, at, callback, args):
+        self.at = at
+        self.callback = callback
+        self.args = args
+        self.node = None  # the node in the heap
+        self.state = PENDING
+
+
+class Scheduler:
+    # clock is a function which returns the current time
+    def __init__(self, clock=time.monotonic, heap_type=HollowHeap):
+        self.clock = clock
+        self.heap = heap_type()
+
+    # Amount of the pending timers
+    @property
+    def no_timers(self):
+        return self.heap.no_nodes
+
+    # Call callback(*args) at the time at.
+    # Return the Timer.
+    # Time complexity: O(1)
+    def schedule(self, at, callback, *args):
+        timer = Timer(at, callback, args)
+        timer.node = self.heap.insert(at, timer)
+        return timer
+
+    # Cancel the timer.
+    # Return False if it has already fired or been cancelled.
+    # Time complexity: O(1) with HollowHeap, unless it is the next timer
+    def cancel(self, timer):
+        if timer.state == DONE:
+            return False
+        if timer.state == PENDING:
+            self.heap.delete(timer.node)
+            timer.node = None
+        timer.state = DONE
+        return True
+
+    # Move the timer to the time at. A timer which has fired or been
+    # cancelled is scheduled again.
+    # Return the timer.
+    # Time complexity: O(1) with HollowHeap if at is earlier, otherwise
+    # the update_key of the engine
+    def reschedule(self, timer, at):
+        if timer.state == PENDING:
+            timer.node = self.heap.update_key(timer.node, at)
+        else:
+            timer.node = self.heap.insert(at, timer)
+            timer.state = PENDING
+        timer.at = at
+        return timer
+
+    # Return the time of the next timer, or None if there are no timers
+    def next_time(self):
+        n = self.heap.find_min()
+        return None if n is None else self.heap.key(n)
+
+    # Fire every timer whose time is not after now, the current time of
+    # the clock by default. The due timers are taken from the heap first,
+    # and then fired in time order. A callback can cancel or reschedule
+    # the other due timers, and the timers it schedules fire in a later
+    # run_due.
+    # Return the amount of the fired timers.
+    def run_due(self, now=None):
+        if now is None:
+            now = self.clock()
+        heap = self.heap
+        due = []
+        n = heap.find_min()
+        while n is not None and not now < heap.key(n):
+            timer = heap.value(heap.delete_min())
+            timer.node = None
+            timer.state = DUE
+            due.append(timer)
+            n = heap.find_min()
+
+        fired = 0
+        for timer in due:
+            if timer.state == DUE:
+                timer.state = DONE
+                fired += 1
+                timer.callback(*timer.args)
+        return fired
@@ -0,0 +1,190 @@
+import gc
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+from hollow_heap import HollowHeap
+
+# Flat binary dump and load of the items of a heap.
+#
+# Pickling a heap walks the links of the nodes recursively, which is slow
+# and overflows the stack with deep trees. dump writes the items as flat
+# columns instead, and load builds a new heap of the items with
+# insert_many in O(n) time. The shape of the trees is not stored, any
+# heap of the same items is as good, and the file can be loaded to any
+# engine.
+#
+# Format, little endian:
+#   header  magic b"HEAP", version u16, key kind u16, count u64
+#   keys    count int64 or float64, or u64 length and a pickled list
+#   offsets count + 1 u64 offsets of the values in the value blob
+#   values  every value pickled on its own
+#
+# The values are pickled one by one, so load_mapped can give them out
+# lazily straight from an mmap of the file.
+#
+#   with open("heap.bin", "wb") as f:
+#       dump(heap, f)
+#   heap, values = load_mapped("heap.bin")
+#   values[heap.value(heap.find_min())]
+
+MAGIC = b"HEAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQ")
+_LENGTH = struct.Struct("<Q")
+
+# key kinds
+_INT = 0
+_FLOAT = 1
+_OBJECT = 2
+
+
+# Return the array of the values in little endian byte order
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+# Write the items of the heap to a binary file
+# Time complexity: O(n)
+def dump(heap, file):
+    keys = []
+    offsets = array("Q", [0])
+    blobs = []
+    size = 0
+    for key, value in heap.items():
+        keys.append(key)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        blobs.append(blob)
+        size += len(blob)
+        offsets.append(size)
+
+    # numbers are stored as a raw column, other keys are pickled
+    kind = _OBJECT
+    if all(type(k) is int for k in keys):
+        try:
+            column = array("q", keys)
+            kind = _INT
+        except OverflowError:
+            pass
+    elif all(type(k) is float for k in keys):
+        column = array("d", keys)
+        kind = _FLOAT
+
+    file.write(_HEADER.pack(MAGIC, VERSION, kind, len(keys)))
+    if kind == _OBJECT:
+        blob = pickle.dumps(keys, pickle.HIGHEST_PROTOCOL)
+        file.write(_LENGTH.pack(len(blob)))
+        file.write(blob)
+    else:
+        file.write(_little_endian(column).tobytes())
+    file.write(_little_endian(offsets).tobytes())
+    for blob in blobs:
+        file.write(blob)
+
+
+# Pause the cyclic garbage collector while the nodes are created.
+# Millions of new nodes would start many full collections,
+# which find nothing to collect.
+@contextmanager
+def _no_gc():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# Read the columns of a dump from a buffer.
+# Return (keys, offsets, start), start is the position of the value blob.
+def _read_columns(buffer):
+    magic, version, kind, count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("The file is not a heap dump.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported heap dump version {version}.")
+
+    pos = _HEADER.size
+    if kind == _OBJECT:
+        (length,) = _LENGTH.unpack_from(buffer, pos)
+        pos += _LENGTH.size
+        keys = pickle.loads(buffer[pos : pos + length])
+        pos += length
+    else:
+        column = array("q" if kind == _INT else "d")
+        column.frombytes(buffer[pos : pos + 8 * count])
+        if sys.byteorder == "big":
+            column.byteswap()
+        keys = column.tolist()
+        pos += 8 * count
+
+    offsets = array("Q")
+    offsets.frombytes(buffer[pos : pos + 8 * (count + 1)])
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    pos += 8 * (count + 1)
+    return keys, offsets, pos
+
+
+# Read a dump from a binary file to a new heap of the given engine.
+# Return the heap.
+# Time complexity: O(n)
+def load(file, heap_type=HollowHeap):
+    buffer = file.read()
+    keys, offsets, start = _read_columns(buffer)
+    blob = memoryview(buffer)[start:]
+    loads = pickle.loads
+    with _no_gc():
+        values = [loads(blob[offsets[i] : offsets[i + 1]]) for i in range(len(keys))]
+        heap = heap_type()
+        heap.insert_many(zip(keys, values), pairs=True)
+    return heap
+
+
+# Values of a dump which are unpickled when asked,
+# straight from an mmap of the file.
+class MappedValues:
+    def __init__(self, map, offsets, start):
+        self._map = map
+        self._offsets = offsets
+        self._start = start
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    # Return the value of the given row
+    def __getitem__(self, row):
+        offsets = self._offsets
+        start = self._start
+        return pickle.loads(self._map[start + offsets[row] : start + offsets[row + 1]])
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Load a dump lazily to a new heap of the given engine.
+# The keys are loaded, but the value of every item is its row in the
+# returned MappedValues, which unpickles the real value when asked.
+# Return (heap, values).
+# Time complexity: O(n) without unpickling any value
+def load_mapped(path, heap_type=HollowHeap):
+    with open(path, "rb") as f:
+        map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    keys, offsets, start = _read_columns(map)
+    with _no_gc():
+        heap = heap_type()
+        heap.insert_many(zip(keys, range(len(keys))), pairs=True)
+    return heap, MappedValues(map, offsets, start)
@@ -0,0 +1,140 @@
+from itertools import islice
+from hollow_heap import HollowHeap
+
+# Streaming k-way merge of sorted iterables.
+#
+# Like heapq.merge, but sources can be added and cancelled while the
+# merge runs. Every source has its next element in the heap, keyed by the
+# element. The source whose element was just given out stays outside the
+# heap as long as its next element is not larger than the heap minimum,
+# so long runs from one source cost one comparison per element. The
+# sources are read in batches.
+#
+#   merge = StreamMerge([a, b], key=len)
+#   c = merge.add(more)   # also in the middle of the merge
+#   merge.cancel(c)
+#   for element in merge:
+#       ...
+#
+# Equal keys of different sources come out in any order.
+
+
+# Sorted iterable being merged
+class Source:
+    __slots__ = ("iterator", "buffer", "index", "head", "key", "node", "active")
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.buffer = []
+        self.index = 0
+        self.head = None  # the next element
+        self.key = None  # the key of the next element
+        self.node = None  # the node of the source in the heap
+        self.active = True
+
+
+class StreamMerge:
+    # key is a function which gives the key of an element, the element
+    # itself by default. batch is the amount of elements read at once.
+    def __init__(self, iterables=(), key=None, heap_type=HollowHeap, batch=256):
+        self.heap_type = heap_type
+        self.heap = heap_type()
+        self.batch = batch
+        self._key = key
+        self._current = None  # the source of the last element, off the heap
+        self.add_many(iterables)
+
+    # Amount of the sources with elements left
+    @property
+    def no_sources(self):
+        return self.heap.no_nodes + (self._current is not None)
+
+    # Add a sorted iterable to the merge.
+    # Return its Source, which can be cancelled.
+    # Time complexity: the insert of the engine
+    def add(self, iterable):
+        s = Source(iterable)
+        if self._advance(s):
+            s.node = self.heap.insert(s.key, s)
+        return s
+
+    # Add many sorted iterables to the merge.
+    # Their first elements are put to a new heap, which is merged to the
+    # heap of the merge.
+    # Return their Sources.
+    # Time complexity: O(m) and the merge of the engine
+    def add_many(self, iterables):
+        other = self.heap_type()
+        sources = [Source(iterable) for iterable in iterables]
+        for s in sources:
+            if self._advance(s):
+                s.node = other.insert(s.key, s)
+
+        # ArrayFibonacciHeap moves the handles of the merged heap
+        offset = self.heap.merge(other)
+        if offset:
+            for s in sources:
+                if s.node is not None:
+                    s.node += offset
+        return sources
+
+    # Stop merging the source, its remaining elements are skipped.
+    # Return False if the source had already ended.
+    # Time complexity: the delete of the engine
+    def cancel(self, source):
+        if not source.active:
+            return False
+        if source is self._current:
+            self._current = None
+        else:
+            self.heap.delete(source.node)
+        self._close(source)
+        return True
+
+    def __iter__(self):
+        return self
+
+    # Return the element with the smallest key
+    def __next__(self):
+        heap = self.heap
+        s = self._current
+        if s is None:
+            n = heap.delete_min()
+            if n is None:
+                raise StopIteration
+            s = heap.value(n)
+        else:
+            n = heap.find_min()
+            if n is not None and heap.key(n) < s.key:
+                # swap the current source with the heap min
+                t = heap.value(heap.delete_min())
+                s.node = heap.insert(s.key, s)
+                s = t
+
+        s.node = None
+        element = s.head
+        self._current = s if self._advance(s) else None
+        return element
+
+    # Move the source to its next element.
+    # Return False if the source has ended.
+    def _advance(self, source):
+        if source.index == len(source.buffer):
+            source.buffer = list(islice(source.iterator, self.batch))
+            source.index = 0
+            if not source.buffer:
+                self._close(source)
+                return False
+        source.head = element = source.buffer[source.index]
+        source.index += 1
+        source.key = element if self._key is None else self._key(element)
+        return True
+
+    def _close(self, source):
+        source.active = False
+        source.node = None
+        source.head = source.key = None
+        source.buffer = []
+        close = getattr(source.iterator, "close", None)
+        if close is not None:
+            close()
@@ -1,10 +1,38 @@
 import unittest
+import asyncio
+import io
+import os
+import tempfile
 import random
+import sys
+import threading
 from hollow_heap import HollowHeap
 from fibonacci_heap import FibonacciHeap
+from array_fibonacci_heap import ArrayFibonacciHeap
+from dary_heap import DaryHeap
+from radix_heap import RadixHeap
+from pairing_heap import PairingHeap
+from instrument import instrument, uninstrument
+import algorithms
+
+try:
+    import numpy as np
+    import numpy_batch
+except ImportError:
+    np = None
+from multi_queue import MultiQueue
+from async_queue import AsyncPriorityQueue
+import serialize
+from external_heap import ExternalHeap
+from stream_merge import StreamMerge
+from top_k import TopK
+from scheduler import Scheduler, VirtualClock
 
 random_seed = 1
 
+# engines with every operation of abstract_heap.Heap
+ENGINES = [FibonacciHeap, HollowHeap, PairingHeap, DaryHeap, ArrayFibonacciHeap]
+
 # Tests methods of the both heaps, Fibonacci heap and Hollow heap
 class TestHeaps(unittest.TestCase):
     # tests if insert() works
@@ -12,16 +40,16 @@ class TestHeaps(unittest.TestCase):
         heap = heap_type()
         for k in [-10, 0, 10, -1.1, 1.1]:
             n = heap.insert(k)
-            self.assertEqual(n.key, k)
-            self.assertEqual(n.val, k)
+            self.assertEqual(heap.key(n), k)
+            self.assertEqual(heap.value(n), k)
 
     # tests if insert() support parameter .val properly
     def insert_key_value_test(self, heap_type):
         heap = heap_type()
         for k, v in [(-10, 0), (0, "A"), (10, [1, 2]), (-1.1, {}), (1.1, 1.1)]:
             n = heap.insert(k, v)
-            self.assertEqual(n.key, k)
-            self.assertEqual(n.val, v)
+            self.assertEqual(heap.key(n), k)
+            self.assertEqual(heap.value(n), v)
 
     # tests if find_min() returns the min node
     def find_min_test(self, heap_type):
@@ -32,7 +60,7 @@ class TestHeaps(unittest.TestCase):
         for k in keys:
             added_keys.append(k)
             heap.insert(k)
-            self.assertEqual(heap.find_min().key, min(added_keys))
+            self.assertEqual(heap.key(heap.find_min()), min(added_keys))
 
     # tests if delete_min() deletes the min node
     def delete_min_test(self, heap_type):
@@ -46,7 +74,7 @@ class TestHeaps(unittest.TestCase):
         while len(keys) > 0:
             min_key = keys.pop(0)
             heap_min = heap.delete_min()
-            self.assertEqual(heap_min.key, min_key)
+            self.assertEqual(heap.key(heap_min), min_key)
 
     # tests if delete() works, and find_min() returns min node
     def delete_test(self, heap_type):
@@ -60,7 +88,7 @@ class TestHeaps(unittest.TestCase):
         while len(nodes) > 1:
             node = nodes.pop(random.randrange(len(nodes)))
             heap.delete(node)
-            self.assertEqual(heap.find_min(), min(nodes, key=lambda n: n.key))
+            self.assertEqual(heap.find_min(), min(nodes, key=heap.key))
 
     # tests if decrease_key() works, and find_min() returns correct min node
     def decrease_key_test(self, heap_type):
@@ -73,10 +101,10 @@ class TestHeaps(unittest.TestCase):
 
         for _ in range(100):
             index = random.randrange(len(nodes))
-            key_new = nodes[index].key - random.randint(1, 1000)
+            key_new = heap.key(nodes[index]) - random.randint(1, 1000)
             nodes[index] = heap.decrease_key(nodes[index], key_new)
-            self.assertEqual(nodes[index].key, key_new)
-            self.assertEqual(heap.find_min(), min(nodes, key=lambda n: n.key))
+            self.assertEqual(heap.key(nodes[index]), key_new)
+            self.assertEqual(heap.find_min(), min(nodes, key=heap.key))
 
     # tests if merge() works, and find_min() returns correct min node
     def merge_test(self, heap_type):
@@ -93,7 +121,7 @@ class TestHeaps(unittest.TestCase):
 
             heap.merge(new_heap)
             all_keys.extend(keys)
-            self.assertEqual(heap.find_min().key, min(all_keys))
+            self.assertEqual(heap.key(heap.find_min()), min(all_keys))
 
     def test_fibo_insert(self):
         self.insert_key_test(FibonacciHeap)
@@ -133,6 +161,958 @@ class TestHeaps(unittest.TestCase):
     def test_hollow_merge(self):
         self.merge_test(HollowHeap)
 
+    # tests the heaps with node pools, nodes are reused after deletion
+    def test_pooled_heaps(self):
+        for heap_type in [FibonacciHeap, HollowHeap]:
+            pooled = lambda: heap_type(pool_size=10)
+            self.delete_min_test(pooled)
+            self.delete_test(pooled)
+            self.decrease_key_test(pooled)
+            self.merge_test(pooled)
+
+    # tests that the pool does not keep the values of deleted nodes
+    def test_pool_drops_values(self):
+        for heap_type in [FibonacciHeap, HollowHeap]:
+            heap = heap_type(pool_size=100)
+            nodes = [heap.insert(i, [i]) for i in range(20)]
+            heap.handle(nodes[15])
+            for n in nodes[10:]:
+                heap.delete(n)
+            self.assertEqual(heap.value(heap.delete_min()), [0])
+            batch = heap.pop_many(3)
+            self.assertEqual([heap.value(n) for n in batch], [[1], [2], [3]])
+            while heap.no_nodes:
+                heap.delete_min()
+            # only the last node given out keeps its value, until the
+            # next insert
+            self.assertEqual(sum(n.val is not None for n in heap._pool), 1)
+            heap.insert(0)
+            self.assertTrue(all(n.val is None for n in heap._pool))
+            if heap_type is HollowHeap:
+                self.assertTrue(all(n.handle is None for n in heap._pool))
+
+    # tests that a hollow heap keeps the value of a deleted min node
+    def test_hollow_delete_min_value(self):
+        heap = HollowHeap()
+        heap.insert(2, "B")
+        heap.insert(1, "A")
+        n = heap.delete_min()
+        self.assertEqual((n.key, n.val), (1, "A"))
+        self.assertEqual(heap.find_min().val, "B")
+
+    # tests if insert_many() and from_iterable() work
+    def insert_many_test(self, heap_type):
+        random.seed(random_seed)
+        keys = random.sample(range(-1000, 1000), 100)
+        heap, nodes = heap_type.from_iterable(keys[:50])
+        self.assertEqual([heap.key(n) for n in nodes], keys[:50])
+
+        pairs = [(k, str(k)) for k in keys[50:]]
+        nodes = heap.insert_many(pairs, pairs=True)
+        self.assertEqual([heap.value(n) for n in nodes], [v for _, v in pairs])
+        self.assertEqual(heap.no_nodes, 100)
+        self.assertEqual(heap.insert_many([]), [])
+
+        for k in sorted(keys):
+            self.assertEqual(heap.key(heap.delete_min()), k)
+
+    def test_fibo_insert_many(self):
+        self.insert_many_test(FibonacciHeap)
+
+    def test_hollow_insert_many(self):
+        self.insert_many_test(HollowHeap)
+
+    # tests that handles stay valid across decrease_key
+    def handle_test(self, heap_type):
+        heap = heap_type()
+        random.seed(random_seed)
+        keys = random.sample(range(-1000, 1000), 100)
+        handles = [heap.handle(heap.insert(k, i)) for i, k in enumerate(keys)]
+        for _ in range(200):
+            i = random.randrange(len(handles))
+            heap.decrease_key(handles[i].node, heap.key(handles[i].node) - 10)
+            self.assertEqual(heap.value(handles[i].node), i)
+        if isinstance(heap, HollowHeap):
+            heap.rebuild()
+
+        heap.delete(handles[0].node)
+        n = heap.delete_min()
+        expected = min(handles[1:], key=lambda h: heap.key(h.node))
+        self.assertIs(n, expected.node)
+
+    def test_fibo_handle(self):
+        self.handle_test(FibonacciHeap)
+
+    def test_hollow_handle(self):
+        self.handle_test(HollowHeap)
+        self.handle_test(lambda: HollowHeap(pool_size=10, rebuild_ratio=1))
+
+    # tests if update_key() works for larger, smaller and equal keys
+    def update_key_test(self, heap_type):
+        heap = heap_type()
+        random.seed(random_seed)
+        nodes = [heap.insert(k) for k in random.sample(range(0, 1000), 100)]
+        nodes.remove(heap.delete_min())  # build some trees
+
+        for _ in range(300):
+            i = random.randrange(len(nodes))
+            new_key = heap.key(nodes[i]) + random.choice([-50, 0, 50, 2000])
+            nodes[i] = heap.update_key(nodes[i], new_key)
+            self.assertEqual(heap.key(nodes[i]), new_key)
+            min_key = min(heap.key(n) for n in nodes)
+            self.assertEqual(heap.key(heap.find_min()), min_key)
+
+        keys = sorted(heap.key(n) for n in nodes)
+        self.assertEqual([heap.key(heap.delete_min()) for _ in keys], keys)
+
+    def test_update_key(self):
+        for heap_type in ENGINES:
+            self.update_key_test(heap_type)
+
+    # tests delete() with keys which cannot be decremented
+    def test_delete_any_key(self):
+        for heap_type in ENGINES:
+            heap = heap_type()
+            random.seed(random_seed)
+            keys = [(random.randrange(10), str(i)) for i in range(100)]
+            nodes = [heap.insert(k) for k in keys]
+            nodes.remove(heap.delete_min())  # build some trees
+
+            while len(nodes) > 1:
+                node = nodes.pop(random.randrange(len(nodes)))
+                heap.delete(node)
+                self.assertEqual(heap.no_nodes, len(nodes))
+                min_key = min(heap.key(n) for n in nodes)
+                self.assertEqual(heap.key(heap.find_min()), min_key)
+
+            heap = heap_type()
+            nodes = [heap.insert(k) for k in ["b", "a", "c"]]
+            heap.delete(nodes[1])
+            self.assertEqual(heap.key(heap.delete_min()), "b")
+
+    # tests iter_sorted() and k_smallest(), the heap must not change
+    def test_iter_sorted(self):
+        for heap_type in ENGINES + [RadixHeap]:
+            heap = heap_type()
+            random.seed(random_seed)
+            nodes = [heap.insert(k) for k in random.sample(range(0, 1000), 100)]
+            nodes.remove(heap.delete_min())  # build some trees
+            if heap_type is not RadixHeap:
+                for _ in range(100):  # cut trees and leave hollow nodes
+                    i = random.randrange(len(nodes))
+                    new_key = heap.key(nodes[i]) - random.randint(1, 100)
+                    nodes[i] = heap.decrease_key(nodes[i], new_key)
+                nodes.remove(heap.delete_min())
+
+            keys = sorted(heap.key(n) for n in nodes)
+            self.assertEqual([heap.key(n) for n in heap.k_smallest(10)], keys[:10])
+            self.assertEqual([heap.key(n) for n in heap.iter_sorted()], keys)
+            self.assertEqual(heap.k_smallest(0), [])
+            self.assertEqual(heap.no_nodes, len(keys))
+            self.assertEqual([heap.key(heap.delete_min()) for _ in keys], keys)
+            self.assertEqual(heap.k_smallest(5), [])
+
+    # Return a heap with some trees and decreased keys, and its keys in
+    # sorted order. No key is decreased below the min, so a radix heap
+    # stays monotone.
+    def make_trees(self, heap_type):
+        heap = heap_type()
+        random.seed(random_seed)
+        nodes = [heap.insert(random.randrange(300)) for _ in range(200)]
+        nodes.remove(heap.delete_min())  # build some trees
+        for _ in range(50):
+            i = random.randrange(len(nodes))
+            new_key = heap.key(nodes[i]) - random.randint(1, 50)
+            if new_key >= heap.key(heap.find_min()):
+                nodes[i] = heap.decrease_key(nodes[i], new_key)
+        return heap, sorted(heap.key(n) for n in nodes)
+
+    # tests pop_until() and pop_many(), also with equal keys
+    def test_pop_until(self):
+        for heap_type in ENGINES + [
+            RadixHeap,
+            lambda: FibonacciHeap(pool_size=10),
+            lambda: HollowHeap(pool_size=10),
+        ]:
+            heap, keys = self.make_trees(heap_type)
+
+            popped = [heap.key(n) for n in heap.pop_until(100)]
+            self.assertEqual(popped, [k for k in keys if k <= 100])
+            keys = keys[len(popped) :]
+            self.assertEqual([heap.key(n) for n in heap.pop_many(30)], keys[:30])
+            keys = keys[30:]
+            self.assertEqual(heap.pop_until(-1), [])
+            self.assertEqual(heap.no_nodes, len(keys))
+
+            heap.insert(keys[-1])
+            keys.append(keys[-1])
+            self.assertEqual([heap.key(heap.delete_min()) for _ in keys], keys)
+            self.assertEqual(heap.pop_many(5), [])
+
+    # tests that the hollow heap removes its hollow top once per batch
+    def test_hollow_batch_removal(self):
+        heap = HollowHeap()
+        calls = []
+        remove_hollow_top = heap._remove_hollow_top
+        heap._remove_hollow_top = lambda: calls.append(1) or remove_hollow_top()
+        for k in range(100):
+            heap.insert(k)
+        self.assertEqual([heap.key(n) for n in heap.pop_many(30)], list(range(30)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(heap.pop_until(49)), 20)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(heap.key(heap.find_min()), 50)
+
+    # tests count_below() and iter_below(), the heap must not change
+    def test_count_below(self):
+        for heap_type in ENGINES + [RadixHeap]:
+            heap, keys = self.make_trees(heap_type)
+
+            for x in [-1, keys[0], 100, keys[-1], keys[-1] + 1]:
+                below = sorted(heap.key(n) for n in heap.iter_below(x))
+                self.assertEqual(below, [k for k in keys if k < x])
+                self.assertEqual(heap.count_below(x), len(below))
+            self.assertEqual(heap.no_nodes, len(keys))
+            self.assertEqual([heap.key(heap.delete_min()) for _ in keys], keys)
+            self.assertEqual(heap.count_below(1000), 0)
+
+    # tests that the handle follows the item when the key increases
+    def test_hollow_update_key_handle(self):
+        heap = HollowHeap()
+        a = heap.handle(heap.insert(1, "A"))
+        b = heap.handle(heap.insert(2, "B"))
+        heap.update_key(a.node, 3)
+        heap.update_key(b.node, 4)
+        self.assertEqual((a.node.key, a.node.val), (3, "A"))
+        self.assertIs(heap.delete_min(), a.node)
+        self.assertIs(heap.delete_min(), b.node)
+
+    # tests hollow node counting and rebuild() of the hollow heap
+    def test_hollow_rebuild(self):
+        heap = HollowHeap()
+        random.seed(random_seed)
+        keys = random.sample(range(-1000, 1000), 100)
+        nodes = [heap.insert(k) for k in keys]
+        for i in range(0, 100, 2):
+            nodes[i] = heap.decrease_key(nodes[i], heap.key(nodes[i]) - 1000)
+        heap.delete(nodes.pop())
+        self.assertEqual(heap.no_nodes, 99)
+        self.assertGreater(heap.no_hollow, 0)
+
+        heap.rebuild()
+        self.assertEqual(heap.no_hollow, 0)
+        for n in sorted(nodes, key=heap.key):
+            self.assertIs(heap.delete_min(), n)
+
+    # tests that rebuild_ratio bounds the amount of hollow nodes
+    def test_hollow_rebuild_ratio(self):
+        heap = HollowHeap(rebuild_ratio=0.5)
+        nodes = [heap.insert(k) for k in range(100)]
+        for _ in range(10):
+            for i in range(1, 100):
+                nodes[i] = heap.decrease_key(nodes[i], heap.key(nodes[i]) - 1)
+                self.assertLessEqual(heap.no_hollow, 0.5 * heap.no_nodes)
+        self.decrease_key_test(lambda: HollowHeap(rebuild_ratio=0.1))
+        self.delete_test(lambda: HollowHeap(rebuild_ratio=0.1))
+
+    def test_array_fibo_insert(self):
+        self.insert_key_test(ArrayFibonacciHeap)
+        self.insert_key_value_test(ArrayFibonacciHeap)
+
+    def test_array_fibo_find_min(self):
+        self.find_min_test(ArrayFibonacciHeap)
+
+    def test_array_fibo_delete_min(self):
+        self.delete_min_test(ArrayFibonacciHeap)
+
+    def test_array_fibo_delete(self):
+        self.delete_test(ArrayFibonacciHeap)
+
+    def test_array_fibo_decrease_key(self):
+        self.decrease_key_test(ArrayFibonacciHeap)
+
+    def test_array_fibo_merge(self):
+        self.merge_test(ArrayFibonacciHeap)
+
+    # tests the Fibonacci heaps against a sorted list with random
+    # operations, so the restructuring gives exactly the same results
+    def test_fibo_random_ops(self):
+        for heap_type in [
+            FibonacciHeap,
+            ArrayFibonacciHeap,
+            lambda: FibonacciHeap(pool_size=10),
+        ]:
+            random.seed(random_seed)
+            heap = heap_type()
+            items = {}  # node -> key
+            for _ in range(3000):
+                op = random.random()
+                if op < 0.4 or not items:
+                    k = random.randrange(1000)
+                    items[heap.insert(k)] = k
+                elif op < 0.6:
+                    n = random.choice(list(items))
+                    k = items[n] - random.randint(1, 100)
+                    items[heap.decrease_key(n, k)] = k
+                elif op < 0.7:
+                    n = random.choice(list(items))
+                    heap.delete(n)
+                    del items[n]
+                else:
+                    n = heap.delete_min()
+                    self.assertEqual(heap.key(n), min(items.values()))
+                    del items[n]
+                self.assertEqual(heap.no_nodes, len(items))
+            keys = [heap.key(heap.delete_min()) for _ in range(len(items))]
+            self.assertEqual(keys, sorted(items.values()))
+
+    # tests a decrease_key which cuts a marked chain deeper than the
+    # recursion limit
+    def test_fibo_deep_cascading_cut(self):
+        depth = sys.getrecursionlimit() + 100
+        for heap_type in [FibonacciHeap, ArrayFibonacciHeap]:
+            heap = heap_type()
+            nodes = [heap.insert(k) for k in range(depth)]
+            # make the node i + 1 a marked child of the node i
+            for i in range(depth - 1, 0, -1):
+                heap._remove_node(nodes[i])
+                heap._add_child(nodes[i], nodes[i - 1])
+                if heap_type is FibonacciHeap:
+                    nodes[i].flag = True
+                else:
+                    heap._flag[nodes[i]] = 1
+
+            heap.decrease_key(nodes[-1], -1)
+            self.assertGreaterEqual(len(list(heap._roots())), depth - 1)
+            keys = [heap.key(heap.delete_min()) for _ in range(depth)]
+            self.assertEqual(keys, [-1] + list(range(depth - 1)))
+
+    def test_dary_insert(self):
+        self.insert_key_test(DaryHeap)
+        self.insert_key_value_test(DaryHeap)
+        self.insert_many_test(DaryHeap)
+
+    def test_dary_find_min(self):
+        self.find_min_test(DaryHeap)
+
+    def test_dary_delete_min(self):
+        self.delete_min_test(DaryHeap)
+        self.delete_min_test(lambda: DaryHeap(d=2))
+
+    def test_dary_delete(self):
+        self.delete_test(DaryHeap)
+        self.delete_test(lambda: DaryHeap(d=3))
+
+    def test_dary_decrease_key(self):
+        self.decrease_key_test(DaryHeap)
+
+    def test_dary_merge(self):
+        self.merge_test(DaryHeap)
+
+    def test_pairing_insert(self):
+        self.insert_key_test(PairingHeap)
+        self.insert_key_value_test(PairingHeap)
+        self.insert_many_test(PairingHeap)
+
+    def test_pairing_find_min(self):
+        self.find_min_test(PairingHeap)
+
+    def test_pairing_delete_min(self):
+        self.delete_min_test(PairingHeap)
+
+    def test_pairing_delete(self):
+        self.delete_test(PairingHeap)
+
+    def test_pairing_decrease_key(self):
+        self.decrease_key_test(PairingHeap)
+
+    def test_pairing_merge(self):
+        self.merge_test(PairingHeap)
+
+    # tests the radix heap with a monotone workload
+    def test_radix_monotone(self):
+        heap = RadixHeap()
+        random.seed(random_seed)
+        nodes = [heap.insert(k) for k in random.sample(range(1000), 100)]
+        last = 0
+        while nodes:
+            n = nodes.pop(random.randrange(len(nodes)))
+            if random.random() < 0.3:
+                heap.delete(n)
+            elif n.key > last:
+                nodes.append(heap.decrease_key(n, random.randint(last, n.key - 1)))
+            else:
+                nodes.append(n)
+
+            if nodes and random.random() < 0.3:
+                n = heap.delete_min()
+                self.assertEqual(n.key, min(m.key for m in nodes))
+                last = n.key
+                nodes.remove(n)
+                nodes.append(heap.insert(last + random.randint(0, 100)))
+            if nodes:
+                self.assertEqual(heap.find_min().key, min(m.key for m in nodes))
+        self.assertEqual(heap.no_nodes, 0)
+
+    # tests that the radix heap rejects keys below the last minimum
+    def test_radix_rejects_lower_keys(self):
+        heap = RadixHeap()
+        n = heap.insert(10)
+        heap.insert(5)
+        heap.delete_min()
+        self.assertRaises(ValueError, heap.insert, 4)
+        self.assertRaises(ValueError, heap.decrease_key, n, 4)
+        self.assertRaises(TypeError, heap.insert, 11.5)
+        self.assertRaises(TypeError, heap.decrease_key, n, 7.5)
+        self.assertRaises(TypeError, RadixHeap().insert, "1")
+        self.assertRaises(TypeError, heap.insert, True)
+        self.assertRaises(TypeError, RadixHeap().insert, False)
+        other = RadixHeap()
+        other.insert(1)
+        self.assertRaises(ValueError, heap.merge, other)
+
+        heap.merge(RadixHeap.from_iterable([7, 6])[0])
+        self.assertEqual([heap.delete_min().key for _ in range(3)], [6, 7, 10])
+
+    # tests that instrumented heaps count their internals
+    def test_instrument(self):
+        for heap_type in [FibonacciHeap, HollowHeap, ArrayFibonacciHeap]:
+            heap = heap_type()
+            stats = instrument(heap, latency=True)
+            nodes = [heap.insert(k) for k in range(100)]
+            heap.delete_min()
+            for i in range(99, 50, -1):
+                nodes[i] = heap.decrease_key(nodes[i], -i)
+            heap.delete_min()
+
+            snapshot = stats.snapshot()
+            self.assertGreater(snapshot["links"], 0)
+            self.assertEqual(snapshot["latency"]["insert"]["count"], 100)
+            if heap_type is HollowHeap:
+                self.assertGreater(snapshot["max_rank"], 0)
+                # 2 deletes and 49 decreases made hollow nodes, the
+                # removed ones were visited, and maybe some with two parents
+                traversed = snapshot["hollow_traversed"]
+                self.assertEqual(traversed["count"], 2)
+                self.assertGreaterEqual(traversed["total"], 51 - heap.no_hollow)
+            else:
+                self.assertGreater(snapshot["max_degree"], 0)
+                self.assertEqual(snapshot["consolidate_roots"]["count"], 2)
+                self.assertEqual(snapshot["consolidate_roots"]["max"], 99)
+
+            heap.pop_until(-90)
+            snapshot = stats.snapshot()
+            self.assertEqual(snapshot["latency"]["pop_until"]["count"], 1)
+            # the calls inside other public calls are not recorded
+            self.assertEqual(snapshot["latency"]["delete_min"]["count"], 2)
+            self.assertNotIn("delete", snapshot["latency"])
+            heap.update_key(heap.find_min(), 1000)
+            latency = stats.snapshot()["latency"]
+            self.assertEqual(latency["update_key"]["count"], 1)
+            self.assertNotIn("delete", latency)
+            self.assertEqual(latency["insert"]["count"], 100)
+            if heap_type is HollowHeap:
+                self.assertEqual(snapshot["hollow_traversed"]["count"], 3)
+
+            self.assertIs(uninstrument(heap), stats)
+            self.assertIs(type(heap), heap_type)
+            self.assertNotIn("_timing", vars(heap))
+            self.assertNotIn("_traversed", vars(heap))
+            self.assertEqual(heap.key(heap.find_min()), -88)
+
+    # tests that the nodes dropped by a rebuild are not counted as
+    # traversed by the delete, and that kept two-parent nodes are
+    def test_instrument_hollow_traversed(self):
+        heap = HollowHeap(rebuild_ratio=1)
+        stats = instrument(heap)
+        nodes = [heap.insert(k) for k in range(10)]
+        heap.delete_min()  # links the nodes under 1
+        for n in nodes[2:7]:
+            heap.delete(n)  # lazy, the 5th one rebuilds
+        self.assertEqual(heap.no_hollow, 0)
+        self.assertEqual(stats.hollow_traversed.snapshot()["total"], 1)
+
+        heap = HollowHeap()
+        stats = instrument(heap)
+        heap.insert(1)
+        heap.insert(2)
+        c = heap.insert(3)
+        c = heap.decrease_key(c, 0)  # c becomes the min, the old c is hollow
+        heap.delete_min()
+        # the hollow old c has the extra parent c, which is removed, and
+        # is kept under 1 until it is visited from there
+        self.assertEqual(stats.hollow_traversed.snapshot()["total"], 2)
+
+    # tests that deleted slots are reused and merged handles are offset
+    def test_array_fibo_handles(self):
+        heap = ArrayFibonacciHeap()
+        a = heap.insert(5, "A")
+        heap.insert(7, "B")
+        self.assertEqual(heap.delete_min(), a)
+        self.assertEqual(heap.insert(3, "C"), a)
+        self.assertEqual(heap.value(heap.find_min()), "C")
+
+        other = ArrayFibonacciHeap()
+        d = other.insert(1, "D")
+        offset = heap.merge(other)
+        self.assertEqual(heap.find_min(), d + offset)
+        self.assertEqual(heap.value(d + offset), "D")
+        self.assertEqual(heap.no_nodes, 3)
+
+        # the merged heap is empty, its old handles do not alias slots
+        self.assertEqual(other.no_nodes, 0)
+        self.assertIsNone(other.find_min())
+        self.assertRaises(IndexError, other.key, d)
+        self.assertRaises(IndexError, other.decrease_key, d, 0)
+
+    # tests that the deleted slots do not keep their values alive
+    def test_array_fibo_release(self):
+        heap = ArrayFibonacciHeap()
+        nodes = [heap.insert(i, [i]) for i in range(100)]
+        for n in nodes[50:]:
+            heap.delete(n)
+        self.assertEqual(sum(v is not None for v in heap._val), 50)
+        for i in range(50):
+            n = heap.delete_min()
+            self.assertEqual(heap.value(n), [i])
+        # only the last popped slot is kept, until the next insert
+        self.assertEqual(sum(v is not None for v in heap._val), 1)
+        heap.insert(0)
+        self.assertEqual(sum(v is not None for v in heap._val), 1)
+
+
+# Tests dump and load of the heap items
+class TestSerialize(unittest.TestCase):
+    # Return a heap with some trees and hollow nodes,
+    # the largest and the smallest key are deleted
+    def make_heap(self, heap_type, keys):
+        heap = heap_type()
+        nodes = [heap.insert(k, (i, str(k))) for i, k in enumerate(keys)]
+        heap.delete(nodes[keys.index(max(keys))])
+        heap.delete_min()
+        return heap
+
+    def test_items(self):
+        random.seed(random_seed)
+        keys = random.sample(range(-1000, 1000), 100)
+        for heap_type in ENGINES:
+            heap = self.make_heap(heap_type, keys)
+            items = sorted(heap.items())
+            self.assertEqual(len(items), heap.no_nodes)
+            self.assertEqual([k for k, _ in items], sorted(keys)[1:-1])
+
+    def test_dump_load(self):
+        random.seed(random_seed)
+        for keys in [
+            random.sample(range(-1000, 1000), 100),
+            [random.random() for _ in range(100)],
+            [(random.randrange(10), str(i)) for i in range(100)],
+            [2**70 + i for i in range(100)],
+            [],
+        ]:
+            for heap_type in [FibonacciHeap, HollowHeap]:
+                heap = self.make_heap(heap_type, keys) if keys else heap_type()
+                f = io.BytesIO()
+                serialize.dump(heap, f)
+                f.seek(0)
+                loaded = serialize.load(f, FibonacciHeap)
+                self.assertEqual(sorted(loaded.items()), sorted(heap.items()))
+
+    def test_load_mapped(self):
+        heap = self.make_heap(HollowHeap, list(range(100, 0, -1)))
+        with tempfile.TemporaryDirectory() as path:
+            path = os.path.join(path, "heap.bin")
+            with open(path, "wb") as f:
+                serialize.dump(heap, f)
+            loaded, values = serialize.load_mapped(path, FibonacciHeap)
+            with values:
+                self.assertEqual(len(values), 98)
+                n = loaded.delete_min()
+                item = (loaded.key(n), values[loaded.value(n)])
+                self.assertEqual(item, (2, (98, "2")))
+
+        self.assertRaises(ValueError, serialize.load, io.BytesIO(b"PICKLE" * 4))
+
+
+# Tests the heap which spills items to disk
+class TestExternalHeap(unittest.TestCase):
+    def test_spill_and_merge(self):
+        random.seed(random_seed)
+        for heap_type in [HollowHeap, FibonacciHeap]:
+            with tempfile.TemporaryDirectory() as directory:
+                heap = ExternalHeap(
+                    memory_items=20,
+                    heap_type=heap_type,
+                    directory=directory,
+                    block=8,
+                    max_runs=4,
+                )
+                items = []
+                for i in range(1000):
+                    k = random.randrange(500)
+                    heap.insert(k, i)
+                    items.append((k, i))
+                    if i % 3 == 0:
+                        key, value = heap.delete_min()
+                        self.assertEqual(key, min(items)[0])
+                        items.remove((key, value))
+
+                self.assertEqual(heap.no_nodes, len(items))
+                out = [heap.delete_min() for _ in range(len(items))]
+                self.assertEqual([k for k, _ in out], sorted(k for k, _ in items))
+                self.assertIsNone(heap.delete_min())
+
+                stats = heap.io_stats()
+                self.assertGreater(stats["runs_written"], 4)
+                self.assertEqual(stats["bytes_read"], stats["bytes_written"])
+                heap.close()
+                self.assertEqual(os.listdir(directory), [])
+
+    # tests that the merges rewrite every spilled item a few times, not
+    # once per merge
+    def test_merge_writes(self):
+        random.seed(random_seed)
+        with ExternalHeap(memory_items=20, block=8, max_runs=4) as heap:
+            for i in range(4000):
+                heap.insert(random.random(), i)
+            stats = heap.io_stats()
+            # 400 spilled runs are merged on log4(400) < 5 levels
+            self.assertGreater(stats["runs_written"], 400)
+            self.assertLess(stats["bytes_written"], 6 * stats["bytes_spilled"])
+            self.assertLess(stats["runs_open"], 4 * 5)
+            keys = [heap.delete_min()[0] for _ in range(4000)]
+            self.assertEqual(keys, sorted(keys))
+
+
+# Tests the streaming k-way merge
+class TestStreamMerge(unittest.TestCase):
+    def test_merge(self):
+        random.seed(random_seed)
+        shards = [sorted(random.sample(range(1000), 50)) for _ in range(10)]
+        # the late shards start after the first 100 elements
+        shards += [sorted(random.sample(range(500, 1000), 50)) for _ in range(10)]
+        for heap_type in [HollowHeap, FibonacciHeap, ArrayFibonacciHeap, DaryHeap]:
+            merge = StreamMerge(shards[:10], heap_type=heap_type, batch=7)
+            out = [next(merge) for _ in range(100)]
+            merge.add_many(shards[10:19])
+            late = merge.add(shards[19])
+            out.extend(merge)
+            self.assertEqual(out, sorted(sum(shards, [])))
+            self.assertFalse(merge.cancel(late))
+            self.assertEqual(merge.no_sources, 0)
+
+    # tests cancelling sources in the heap and the current one
+    def test_cancel(self):
+        merge = StreamMerge(key=lambda s: s[0])
+        a = merge.add(["a1", "a2", "a3"])
+        b = merge.add(["b1", "b2"])
+        c = merge.add(iter(["c1", "c2"]))
+        self.assertEqual(next(merge), "a1")
+        self.assertTrue(merge.cancel(a))  # the current source
+        self.assertTrue(merge.cancel(c))
+        self.assertFalse(merge.cancel(c))
+        self.assertEqual(list(merge), ["b1", "b2"])
+        self.assertFalse(b.active)
+
+
+# Tests the bounded top-k container
+class TestTopK(unittest.TestCase):
+    def test_top_k(self):
+        random.seed(random_seed)
+        keys = [random.randrange(1000) for _ in range(500)]
+        for heap_type in [HollowHeap, FibonacciHeap, PairingHeap, DaryHeap]:
+            for largest in [True, False]:
+                best = TopK(10, heap_type=heap_type, largest=largest)
+                self.assertIsNone(best.threshold)
+                for i, k in enumerate(keys):
+                    best.offer(k, i)
+                    self.assertLessEqual(best.no_nodes, 10)
+
+                expected = sorted(keys, reverse=largest)[:10]
+                items = best.sorted_items()
+                self.assertEqual([k for k, _ in items], expected)
+                self.assertEqual([keys[i] for _, i in items], expected)
+                self.assertEqual(best.threshold, expected[-1])
+
+    def test_threshold(self):
+        best = TopK(2)
+        self.assertTrue(best.offer(5, "A"))
+        self.assertTrue(best.offer(3, "B"))
+        self.assertEqual(best.threshold, 3)
+        self.assertFalse(best.offer(3, "C"))
+        self.assertTrue(best.offer(4, "D"))
+        self.assertEqual(best.threshold, 4)
+        self.assertEqual(best.sorted_items(), [(5, "A"), (4, "D")])
+
+
+# Tests the timers with a virtual clock
+class TestScheduler(unittest.TestCase):
+    def test_timers(self):
+        for heap_type in [HollowHeap, FibonacciHeap, PairingHeap]:
+            clock = VirtualClock()
+            scheduler = Scheduler(clock, heap_type)
+            fired = []
+            timers = [scheduler.schedule(t, fired.append, t) for t in range(10)]
+            self.assertTrue(scheduler.cancel(timers[5]))
+            self.assertFalse(scheduler.cancel(timers[5]))
+            scheduler.reschedule(timers[9], 2.5)
+            scheduler.reschedule(timers[1], 20)
+            self.assertEqual(scheduler.next_time(), 0)
+
+            clock.advance(4)
+            self.assertEqual(scheduler.run_due(), 5)
+            self.assertEqual(fired, [0, 2, 9, 3, 4])
+            self.assertEqual(scheduler.run_due(19), 3)
+            self.assertEqual(fired[5:], [6, 7, 8])
+            self.assertFalse(scheduler.cancel(timers[0]))
+
+            scheduler.reschedule(timers[0], 30)  # schedule a fired timer again
+            self.assertEqual(scheduler.no_timers, 2)
+            self.assertEqual(scheduler.run_due(100), 2)
+            self.assertEqual(fired[8:], [1, 0])
+            self.assertIsNone(scheduler.next_time())
+
+    # tests callbacks which change the other due timers
+    def test_callbacks(self):
+        scheduler = Scheduler(VirtualClock())
+        fired = []
+        a = scheduler.schedule(1, lambda: scheduler.cancel(b))
+        b = scheduler.schedule(2, fired.append, "b")
+        c = scheduler.schedule(3, lambda: scheduler.schedule(3, fired.append, "d"))
+        self.assertEqual(scheduler.run_due(5), 2)
+        self.assertEqual(fired, [])
+        self.assertEqual(scheduler.run_due(5), 1)
+        self.assertEqual(fired, ["d"])
+        self.assertFalse(scheduler.cancel(a) or scheduler.cancel(c))
+
+
+# Return a random graph as CSR arrays, every edge in both directions
+def random_graph(n, edges):
+    adjacency = [[] for _ in range(n)]
+    for _ in range(edges):
+        u, v, w = random.randrange(n), random.randrange(n), random.randint(0, 20)
+        adjacency[u].append((v, w))
+        adjacency[v].append((u, w))
+    indptr, indices, weights = [0], [], []
+    for edges_of_u in adjacency:
+        for v, w in edges_of_u:
+            indices.append(v)
+            weights.append(w)
+        indptr.append(len(indices))
+    return indptr, indices, weights
+
+
+# Tests the graph algorithms with every engine
+class TestAlgorithms(unittest.TestCase):
+    def setUp(self):
+        random.seed(random_seed)
+        self.graph = random_graph(60, 150)
+        indptr, indices, weights = self.graph
+
+        # Floyd-Warshall distances
+        n = len(indptr) - 1
+        self.dist = [
+            [0 if u == v else float("inf") for v in range(n)] for u in range(n)
+        ]
+        for u in range(n):
+            for i in range(indptr[u], indptr[u + 1]):
+                v = indices[i]
+                self.dist[u][v] = min(self.dist[u][v], weights[i])
+        for k in range(n):
+            for u in range(n):
+                for v in range(n):
+                    if self.dist[u][k] + self.dist[k][v] < self.dist[u][v]:
+                        self.dist[u][v] = self.dist[u][k] + self.dist[k][v]
+
+    def test_dijkstra(self):
+        for heap_type in ENGINES + [RadixHeap]:
+            dist, pred = algorithms.dijkstra(*self.graph, 0, heap_type)
+            self.assertEqual(dist, self.dist[0])
+            for v, p in enumerate(pred):
+                if p != -1:
+                    self.assertLessEqual(dist[p], dist[v])
+
+    def test_prim(self):
+        indptr, indices, weights = self.graph
+        edges = sorted(
+            (weights[i], u, indices[i])
+            for u in range(60)
+            for i in range(indptr[u], indptr[u + 1])
+        )
+
+        # Kruskal on the component of the vertex 0
+        root = list(range(60))
+
+        def find(u):
+            while root[u] != u:
+                u = root[u]
+            return u
+
+        total = 0
+        for w, u, v in edges:
+            if self.dist[0][u] != float("inf") and find(u) != find(v):
+                root[find(u)] = find(v)
+                total += w
+
+        reachable = sum(d != float("inf") for d in self.dist[0])
+        for heap_type in ENGINES:
+            parent, prim_total = algorithms.prim(*self.graph, 0, heap_type)
+            self.assertEqual(prim_total, total)
+            self.assertEqual(sum(p != -1 for p in parent), reachable - 1)
+
+    def test_a_star(self):
+        _, target = max((d, v) for v, d in enumerate(self.dist[0]) if d != float("inf"))
+        for heap_type in ENGINES:
+            d, path = algorithms.a_star(*self.graph, 0, target, lambda v: 0, heap_type)
+            self.assertEqual(d, self.dist[0][target])
+            self.assertEqual((path[0], path[-1]), (0, target))
+
+    def test_dijkstra_many(self):
+        results = algorithms.dijkstra_many(*self.graph, [0, 5, 9], processes=2)
+        self.assertEqual(
+            [dist for dist, _ in results], [self.dist[s] for s in [0, 5, 9]]
+        )
+
+
+# Tests the concurrent MultiQueue
+class TestMultiQueue(unittest.TestCase):
+    def test_strict_order(self):
+        random.seed(random_seed)
+        keys = [random.randrange(1000) for _ in range(300)]
+        for heap_type in [HollowHeap, FibonacciHeap, ArrayFibonacciHeap]:
+            queue = MultiQueue(shards=4, heap_type=heap_type, strict=True, seed=1)
+            for i, k in enumerate(keys):
+                queue.insert(k, i)
+            self.assertEqual(queue.no_nodes, len(keys))
+            items = [queue.delete_min() for _ in keys]
+            self.assertEqual([k for k, _ in items], sorted(keys))
+            self.assertEqual(sorted(i for _, i in items), list(range(len(keys))))
+            self.assertIsNone(queue.delete_min())
+
+    # tests that every item comes out exactly once with many threads
+    def test_relaxed_threads(self):
+        queue = MultiQueue(shards=4, seed=1)
+        taken = []
+
+        def producer(t):
+            for i in range(500):
+                queue.insert(random.random(), (t, i))
+
+        def consumer():
+            items = []
+            while len(items) < 500:
+                item = queue.delete_min()
+                if item is not None:
+                    items.append(item[1])
+            taken.extend(items)
+
+        threads = [threading.Thread(target=producer, args=(t,)) for t in range(4)]
+        threads += [threading.Thread(target=consumer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(taken), [(t, i) for t in range(4) for i in range(500)])
+        self.assertIsNone(queue.delete_min())
+
+
+# Tests the asyncio priority queue
+class TestAsyncPriorityQueue(unittest.TestCase):
+    def test_reprioritize_and_cancel(self):
+        async def run(heap_type):
+            queue = AsyncPriorityQueue(heap_type=heap_type)
+            handles = {}
+            for k, v in [(5, "A"), (3, "B"), (8, "C"), (6, "D")]:
+                handles[v] = await queue.put((k, v))
+            self.assertTrue(queue.reprioritize(handles["C"], 1))
+            self.assertTrue(queue.reprioritize(handles["B"], 7))
+            self.assertTrue(queue.cancel(handles["D"]))
+            self.assertFalse(queue.cancel(handles["D"]))
+            self.assertEqual(queue.qsize(), 3)
+
+            items = []
+            while not queue.empty():
+                items.append(await queue.get())
+                queue.task_done()
+            self.assertEqual(items, [(1, "C"), (5, "A"), (7, "B")])
+            self.assertFalse(queue.reprioritize(handles["A"], 0))
+            await asyncio.wait_for(queue.join(), 1)
+
+        for heap_type in [HollowHeap, FibonacciHeap, ArrayFibonacciHeap]:
+            asyncio.run(run(heap_type))
+
+    # tests that a full queue blocks put until an item leaves
+    def test_maxsize(self):
+        async def run():
+            queue = AsyncPriorityQueue(maxsize=2)
+            queue.put_nowait((2, "B"))
+            job = queue.put_nowait((1, "A"))
+            self.assertRaises(asyncio.QueueFull, queue.put_nowait, (3, "C"))
+
+            put = asyncio.create_task(queue.put((0, "D")))
+            await asyncio.sleep(0)
+            self.assertFalse(put.done())
+            queue.cancel(job)
+            await asyncio.wait_for(put, 1)
+            self.assertEqual(await queue.get(), (0, "D"))
+            self.assertEqual(queue.get_nowait(), (2, "B"))
+
+        asyncio.run(run())
+
+
+# Tests the NumPy batch operations
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpyBatch(unittest.TestCase):
+    def test_insert_and_pop(self):
+        random.seed(random_seed)
+        keys = np.array(random.sample(range(1000), 100), dtype=np.float64)
+        for heap_type in [HollowHeap, FibonacciHeap, ArrayFibonacciHeap]:
+            heap = heap_type()
+            handles = numpy_batch.insert_array(heap, keys, np.arange(100))
+            self.assertEqual(len(handles), 100)
+            self.assertEqual(heap.value(handles[7]), 7)
+
+            out_keys = np.empty(30)
+            out_values = np.empty(30, dtype=np.int64)
+            for _ in range(4):
+                count = numpy_batch.pop_k(heap, out_keys, out_values)
+            self.assertEqual(count, 10)
+            self.assertEqual(out_keys[:count].tolist(), sorted(keys)[90:])
+            self.assertEqual(
+                keys[out_values[:count]].tolist(), out_keys[:count].tolist()
+            )
+
+    def test_decrease_keys(self):
+        for heap_type, empty in [(HollowHeap, None), (ArrayFibonacciHeap, -1)]:
+            heap = heap_type()
+            handles = np.full(5, empty, dtype=object if empty is None else np.int64)
+            keys = np.full(5, np.inf)
+            ids = numpy_batch.decrease_keys(heap, handles, keys, [3, 1, 3], [9, 8, 4])
+            self.assertEqual(sorted(ids.tolist()), [1, 3])
+            ids = numpy_batch.decrease_keys(heap, handles, keys, [1, 3, 0], [9, 2, 6])
+            self.assertEqual(sorted(ids.tolist()), [0, 3])
+            self.assertEqual(keys.tolist(), [6, 8, np.inf, 2, np.inf])
+            self.assertEqual(heap.key(heap.delete_min()), 2)
+            self.assertEqual(heap.value(heap.find_min()), 0)
+
+    # tests a Dijkstra which relaxes the edges in NumPy
+    def test_batch_dijkstra(self):
+        random.seed(random_seed)
+        indptr, indices, weights = (np.array(a) for a in random_graph(200, 600))
+        expected, _ = algorithms.dijkstra(indptr, indices, weights, 0)
+        for heap_type in [HollowHeap, FibonacciHeap]:
+            heap = heap_type()
+            handles = np.full(200, None, dtype=object)
+            dist = np.full(200, np.inf)
+            numpy_batch.decrease_keys(heap, handles, dist, [0], [0.0])
+            out_keys, out_values = np.empty(1), np.empty(1, dtype=np.int64)
+            while numpy_batch.pop_k(heap, out_keys, out_values):
+                u = out_values[0]
+                edges = slice(indptr[u], indptr[u + 1])
+                new_dist = out_keys[0] + weights[edges]
+                numpy_batch.decrease_keys(heap, handles, dist, indices[edges], new_dist)
+            self.assertEqual(dist.tolist(), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
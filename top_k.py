@@ -0,0 +1,84 @@
+from operator import itemgetter
+from hollow_heap import HollowHeap
+
+# Bounded container of the k best items of a stream.
+#
+# The worst kept item is the min of a heap, so it can be evicted. An item
+# which is not better than the threshold, the key of the worst kept item,
+# is rejected with one comparison. By default the best items are the
+# largest keys, with largest=False the smallest keys.
+#
+#   best = TopK(10000)
+#   for score, candidate in stream:
+#       if best.threshold is None or score > best.threshold:
+#           best.offer(score, candidate)
+#   best.sorted_items()  # -> [(score, candidate), ...], best first
+
+
+# Key with reversed order, the largest key is the min of the heap
+class _Reversed:
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __gt__(self, other):
+        return self.key < other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TopK:
+    def __init__(self, k, heap_type=HollowHeap, largest=True):
+        assert k >= 1, "The container needs room for at least one item."
+        self.k = k
+        self.largest = largest
+        self.heap = heap_type()
+        self._worst = None  # heap key of the worst kept item, when full
+
+    # Amount of the kept items
+    @property
+    def no_nodes(self):
+        return self.heap.no_nodes
+
+    # The key an item must beat when the container is full,
+    # or None while there is room
+    @property
+    def threshold(self):
+        worst = self._worst
+        if worst is None or self.largest:
+            return worst
+        return worst.key
+
+    # Offer an item to the container.
+    # Return True if it was kept.
+    # Time complexity: O(1) if rejected, otherwise the insert of the
+    # engine and the delete_min of the engine if an item is evicted
+    def offer(self, key, value=None):
+        if value is None:
+            value = key
+        worst = self._worst
+        if not self.largest:
+            key = _Reversed(key)
+        if worst is not None and not worst < key:
+            return False
+
+        heap = self.heap
+        if worst is not None:
+            heap.delete_min()
+        heap.insert(key, value)
+        if heap.no_nodes == self.k:
+            self._worst = heap.key(heap.find_min())
+        return True
+
+    # Return the kept items as (key, value) pairs, the best first.
+    # Time complexity: O(k log k)
+    def sorted_items(self):
+        items = self.heap.items()
+        if not self.largest:
+            items = ((key.key, value) for key, value in items)
+        return sorted(items, key=itemgetter(0), reverse=self.largest)
@@ -21,7 +21,7 @@ def visualize(_heap, title="Heap", debug_print=True, file_name=None, highlight=N
             if highlight is not None and n == highlight:
                 style = "highlight"
             # if hollow
-            elif hasattr(n, "item") and n.item is None:
+            elif getattr(n, "hollow", False):
                 label_dict[n] = ""
                 style = "hollow"
             # if min